@@ -8,6 +8,10 @@ import PyPDF2
 
 load_dotenv()
 
+def extract_text(uploaded_file):
+    """Resume text, joined once instead of with repeated +="""
+    return "".join(page.extract_text() or "" for page in PyPDF2.PdfReader(uploaded_file).pages)
+
 llm = ChatOpenAI(model_name="gpt-4o", temperature=0.3, openai_api_key=os.getenv("OPENAI_API_KEY"))
 
 prompt = PromptTemplate(
@@ -30,10 +34,7 @@ if st.button("Get Cover Letter"):
         st.warning("Please upload your resume and enter both job title and company name.")
     else:
         if uploaded_file.type == "application/pdf":
-            pdf_reader = PyPDF2.PdfReader(uploaded_file)
-            resume_text = ""
-            for page in pdf_reader.pages:
-                resume_text += page.extract_text()
+            resume_text = extract_text(uploaded_file)
         elif uploaded_file.type == "text/plain":
             resume_text = str(uploaded_file.read(), "utf-8")
         else:
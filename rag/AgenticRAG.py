@@ -1,10 +1,14 @@
 import streamlit as st
-from PyPDF2 import PdfReader
 from openai import OpenAI
 import requests
-from sentence_transformers import SentenceTransformer
-from langchain_community.vectorstores import FAISS
+import faiss
+import numpy as np
+from bisect import bisect_right
 from dotenv import load_dotenv
+from pdf_pipeline import extract_pages
+from relevance_gate import RelevanceGate, load_cross_encoder
+from speculative_search import SpeculativeSearch
+import hashlib
 import os
 
 load_dotenv()
@@ -12,37 +16,142 @@ load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
 serpapi_api_key = os.getenv("SERPAPI_API_KEY")
 
-client = OpenAI()
+_client = None
+
+def get_client():
+     """Created on first use, so the offline tools (calibrate_gate.py, agentic_rag_bench.py) run without an API key"""
+     global _client
+     if _client is None:
+          _client = OpenAI()
+     return _client
+
+# Start the web search alongside the LLM verifier instead of after its verdict
+SPECULATIVE_SEARCH = os.getenv("RAG_SPECULATIVE_SEARCH", "1") == "1"
+
+# torch (sentence-transformers), onnx or onnx-int8 (see onnx_embeddings.py)
+EMBEDDING_BACKEND = os.getenv("RAG_EMBEDDING_BACKEND", "torch")
+
+#===== Embedding Model =====
+def load_embedding_model():
+     """Both backends expose a SentenceTransformer-style encode()"""
+     if EMBEDDING_BACKEND in ("onnx", "onnx-int8"):
+          from onnx_embeddings import ONNXMiniLMEmbeddings
+          return ONNXMiniLMEmbeddings(quantized=EMBEDDING_BACKEND == "onnx-int8")
+     from sentence_transformers import SentenceTransformer
+     return SentenceTransformer('all-MiniLM-L6-v2')
 
-#===== Load PDF & Create Index =====
 @st.cache_resource
-def load_pdfs_and_create_index(pdf_paths):
-     docs = []
-     for path in pdf_paths:
-          reader = PdfReader(path)
-          text = "\n".join(page.extract_text() for page in reader.pages if page.extract_text())
-          docs.append(text)
-          
-          chunks = []
-          for doc in docs:
-                for i in range(0, len(doc), 500):
-                       chunk = doc[i:i + 500]
-                       if chunk.strip():
-                              chunks.append(chunk)
-
-                model = SentenceTransformer('all-MiniLM-L6-v2')
-                vectors = model.encode(chunks)
-                
-                index = FAISS.IndexFlatL2(vectors.shape[1])
-                index.add(vectors)
-                
-                return index, chunks, model
-          
+def get_embedding_model():
+     """Loaded once per process and shared by every session"""
+     return load_embedding_model()
+
+#===== Indexing Engine =====
+CHUNK_SIZE = 500
+ENCODE_BATCH_SIZE = 256
+
+class PDFIndex:
+     """One FAISS index over the chunks of many PDFs, extended as more PDFs arrive.
+
+     Row i of the index is ``chunks[i]``, found at ``locations[i]`` =
+     (file name, page number, character offset within that page), from the
+     PDF with content hash ``row_files[i]``.
+     """
+     def __init__(self, model):
+          self.model = model
+          self.index = None
+          self.chunks = []
+          self.locations = []
+          self.row_files = []
+          self.files = {}  # content hash -> file name, so re-uploads are not indexed twice
+
+     def _chunk_pdf(self, name, pdf_bytes):
+          # Chunk the whole document like before, then map each offset back to its page
+          page_texts = [text for _, text in extract_pages(pdf_bytes)]
+          page_starts, position = [], 0
+          for text in page_texts:
+               page_starts.append(position)
+               position += len(text) + 1
+          text = "\n".join(page_texts)
+          for i in range(0, len(text), CHUNK_SIZE):
+               chunk = text[i:i + CHUNK_SIZE]
+               if chunk.strip():
+                    page = bisect_right(page_starts, i) - 1
+                    yield chunk, (name, page + 1, i - page_starts[page])
+
+     def add_pdfs(self, files):
+          """Index PDFs not seen before; returns (chunks added, {file name: error} for PDFs that failed)"""
+          new_chunks, new_locations, new_row_files, new_files, errors = [], [], [], {}, {}
+          for file in files:
+               pdf_bytes = file.getvalue()
+               digest = hashlib.sha256(pdf_bytes).hexdigest()
+               if digest in self.files or digest in new_files:
+                    continue
+               try:
+                    file_chunks = list(self._chunk_pdf(file.name, pdf_bytes))
+               except Exception as e:
+                    errors[file.name] = e  # not recorded, so it is retried on the next rerun
+                    continue
+               new_files[digest] = file.name
+               for chunk, location in file_chunks:
+                    new_chunks.append(chunk)
+                    new_locations.append(location)
+                    new_row_files.append(digest)
+          if not new_chunks:
+               self.files.update(new_files)  # e.g. scanned PDFs without a text layer
+               return 0, errors
+
+          # All new chunks from all files in one batched encode
+          vectors = np.asarray(self.model.encode(new_chunks, batch_size=ENCODE_BATCH_SIZE), dtype=np.float32)
+          if self.index is None:
+               self.index = faiss.IndexFlatL2(vectors.shape[1])
+          self.index.add(vectors)
+          self.chunks.extend(new_chunks)
+          self.locations.extend(new_locations)
+          self.row_files.extend(new_row_files)
+          # Only now are the files really in the index
+          self.files.update(new_files)
+          return len(new_chunks), errors
+
+     def remove_files(self, digests):
+          """Drop the PDFs with these content hashes; returns the number of chunks removed"""
+          digests = set(digests) & set(self.files)
+          if not digests:
+               return 0
+          for digest in digests:
+               del self.files[digest]
+          keep = [i for i, digest in enumerate(self.row_files) if digest not in digests]
+          removed = len(self.row_files) - len(keep)
+          if removed:
+               # Flat indexes are cheap to rebuild from their own vectors, no re-encoding needed
+               vectors = self.index.reconstruct_n(0, self.index.ntotal)[keep]
+               self.index = faiss.IndexFlatL2(self.index.d)
+               self.index.add(vectors)
+               self.chunks = [self.chunks[i] for i in keep]
+               self.locations = [self.locations[i] for i in keep]
+               self.row_files = [self.row_files[i] for i in keep]
+          return removed
+
+     def sync(self, files):
+          """Match the index to ``files``: drop PDFs no longer among them and add new ones.
+
+          Returns (chunks added, chunks removed, {file name: error}).
+          """
+          current = {hashlib.sha256(file.getvalue()).hexdigest() for file in files}
+          removed = self.remove_files(set(self.files) - current)
+          added, errors = self.add_pdfs(files)
+          return added, removed, errors
+
+     def search(self, query, top_k=3):
+          """[(chunk, (file, page, offset), squared L2 distance)] nearest first"""
+          if self.index is None:
+               return []
+          query_vector = np.asarray(self.model.encode([query]), dtype=np.float32)
+          distances, indices = self.index.search(query_vector, top_k)
+          return [(self.chunks[i], self.locations[i], float(d)) for d, i in zip(distances[0], indices[0]) if i != -1]
+
 #===== Retrieve Relevant Chunks =====
-def retrieve(query, index, chunks, model, top_k=3):
-     query_vector = model.encode([query])
-     distances, indices = index.search(query_vector, top_k)
-     return [chunks[i] for i in indices[0] ]
+def retrieve(query, pdf_index, top_k=3):
+     return [chunk for chunk, _, _ in pdf_index.search(query, top_k)]
 
 #===== Verifier =====
 def is_answer_correct(answer, query):
@@ -52,14 +161,15 @@ def is_answer_correct(answer, query):
 
         Is the answer correct? Respond with 'yes' or 'no'.
         """
-     response = client.chat.completions.create(model="gpt-4o",
+     response = get_client().chat.completions.create(model="gpt-4o",
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that verifies answers."},
                 {"role": "user", "content": prompt}],            temperature=0)
      return response.choices[0].message.content
 
 #===== Fall Back : Web Search =====
-def web_search(query):
+def web_search(query, cancelled=None):
+     """``cancelled`` (a threading.Event) is set when a speculative search is no longer needed"""
      search_url = "https://serpapi.com/search.json"
      params = {
           "engine": "google",
@@ -74,45 +184,91 @@ def web_search(query):
           snippet = result.get("snippet") or result.get("title")
           if snippet:
                snippets.append(snippet)
-               if snippets:
-                     return "\n".join(snippets) 
-               else:
-                     # if search failed , ask llm to answer from scratch
-                     fallback_prompt = f"""
-                     The web search for the question "{query}" returned no results. 
-                     Please answer the question based on your knowledge."""
-                     
-                     response = client.chat.completions.create(model="gpt-4o",
-                            messages=[
-                                {"role": "system", "content": "You are a helpful assistant that answers questions."},
-                                {"role": "user", "content": fallback_prompt}], temperature=0)
-                     return response.choices[0].message.content
-               
+     if snippets:
+          return "\n".join(snippets)
+     if cancelled is not None and cancelled.is_set():
+          return ""
+     # if search failed , ask llm to answer from scratch
+     fallback_prompt = f"""
+     The web search for the question "{query}" returned no results. 
+     Please answer the question based on your knowledge."""
+     
+     response = get_client().chat.completions.create(model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant that answers questions."},
+                {"role": "user", "content": fallback_prompt}], temperature=0)
+     return response.choices[0].message.content
+
+@st.cache_resource
+def get_relevance_gate():
+     """Local scores settle most questions; gpt-4o is only asked about ambiguous ones"""
+     return RelevanceGate(
+          verifier=lambda context, query: is_answer_correct(context, query).strip().lower() == 'yes',
+          cross_encoder=load_cross_encoder(),
+     )
+
+@st.cache_resource
+def get_speculative_search():
+     """Shared by all sessions so identical in-flight searches are made once"""
+     return SpeculativeSearch(web_search) if SPECULATIVE_SEARCH else None
 
 #===== Orchestrator =====
-def answer_query(query, index, chunks, model):
-     relevant_chunks = retrieve(query, index, chunks, model)
-     context = "\n".join(relevant_chunks)
+def answer_query(query, pdf_index, gate, searches=None):
+     results = pdf_index.search(query)
+     context = "\n".join(chunk for chunk, _, _ in results)
      
-     verdict = is_answer_correct(context, query)
+     # Only questions that go to the LLM verifier speculate; local decisions are instant
+     handles = []
+     def start_search():
+          if searches is not None:
+               handles.append(searches.start(query))
      
-     if verdict.strip().lower() == 'yes':
-          return f"Based on the document context:\n{context}    \nThe answer to your question '{query}' is correct."
-     else:
-          serp_reults = web_search(query)
-          return f"Based on the web search results:\n{serp_reults}    \nThe answer to your question '{query}' is provided from web search."
+     try:
+          if gate.is_relevant(query, results, on_escalate=start_search):
+               return f"Based on the document context:\n{context}    \nThe answer to your question '{query}' is correct."
+          else:
+               if not handles:
+                    start_search()  # still joins an identical search already in flight
+               serp_reults = handles[0].result() if handles else web_search(query)
+               return f"Based on the web search results:\n{serp_reults}    \nThe answer to your question '{query}' is provided from web search."
+     finally:
+          # Unused speculative searches are cancelled once no other question is waiting on them
+          for handle in handles:
+               handle.release()
      
 #===== Streamlit UI =====
-st.title("Agentic RAG: PDF + Web Search")
-uploaded_files = st.file_uploader("Upload PDF files", type="pdf", accept_multiple_files=True)
-if uploaded_files:
-     pdf_paths = [file for file in uploaded_files]
-     index, chunks, model = load_pdfs_and_create_index(pdf_paths)
-     
-     user_question = st.text_input("Ask a question about the PDFs:")
-     
-     if user_question:
-          with st.spinner("Generating answer..."):
-               response = answer_query(user_question, index, chunks, model)
-               st.write("Answer:")
-               st.write(response)
\ No newline at end of file
+def main():
+     st.title("Agentic RAG: PDF + Web Search")
+     uploaded_files = st.file_uploader("Upload PDF files", type="pdf", accept_multiple_files=True)
+     if not uploaded_files:
+          # Nothing uploaded any more: start from an empty index next time
+          st.session_state.pop("pdf_index", None)
+     else:
+          # Each session keeps its own index in step with the uploader; unchanged files are not re-encoded
+          if "pdf_index" not in st.session_state:
+               st.session_state.pdf_index = PDFIndex(get_embedding_model())
+          pdf_index = st.session_state.pdf_index
+          with st.spinner("Indexing PDFs..."):
+               added, removed, errors = pdf_index.sync(uploaded_files)
+          for name, error in errors.items():
+               st.error(f"Error reading {name}: {error}")
+          if added or removed:
+               st.success(f"Indexed {added} new chunks, removed {removed} "
+                          f"({len(pdf_index.chunks)} from {len(pdf_index.files)} PDFs in total)")
+          
+          gate = get_relevance_gate()
+          user_question = st.text_input("Ask a question about the PDFs:")
+          
+          if user_question:
+               with st.spinner("Generating answer..."):
+                    response = answer_query(user_question, pdf_index, gate, get_speculative_search())
+                    st.write("Answer:")
+                    st.write(response)
+          
+          report = gate.report()
+          if report["questions"]:
+               st.sidebar.caption(f"Relevance gate: {report['llm_calls_avoided']}/{report['questions']} "
+                                  f"verifier calls avoided ({report['avoided_rate']:.0%})")
+
+if __name__ == "__main__":
+     main()
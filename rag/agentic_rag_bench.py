@@ -0,0 +1,130 @@
+"""Benchmarks for AgenticRAG.py with stubbed retrieval, verifier and web search.
+
+Usage:
+    python agentic_rag_bench.py speculative [--queries 400] [--clients 8] [--verifier-delay 0.8]
+                                            [--search-delay 0.6] [--fallback-delay 0.8]
+"""
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+
+import AgenticRAG
+from AgenticRAG import answer_query
+from relevance_gate import RelevanceGate
+from speculative_search import SpeculativeSearch
+
+# Top-chunk distances that the default gate thresholds treat as relevant, ambiguous and irrelevant
+LOCAL_RELEVANT_DISTANCE = 0.2
+AMBIGUOUS_DISTANCE = 1.0
+LOCAL_IRRELEVANT_DISTANCE = 1.8
+
+
+class StubScenario:
+    """Per-question latencies and outcomes, drawn once so both modes replay the same traffic"""
+
+    def __init__(self, args, seed: int = 5):
+        rng = random.Random(seed)
+        self.args = args
+        self.questions: Dict[str, Dict] = {}
+        for i in range(args.distinct):
+            kind = rng.random()
+            self.questions[f"question {i}"] = {
+                "distance": (LOCAL_RELEVANT_DISTANCE if kind < args.local_relevant else
+                             AMBIGUOUS_DISTANCE if kind < args.local_relevant + args.ambiguous else
+                             LOCAL_IRRELEVANT_DISTANCE),
+                # Log-normal service times give the long tail seen from hosted APIs
+                "verifier": args.verifier_delay * rng.lognormvariate(0, 0.5),
+                "verdict": rng.random() < args.yes_rate,
+                "search": args.search_delay * rng.lognormvariate(0, 0.5),
+                "empty": rng.random() < args.empty_rate,
+                "fallback": args.fallback_delay * rng.lognormvariate(0, 0.5),
+            }
+        # Popular questions repeat, so concurrent clients ask identical ones
+        weights = [1 / (rank + 1) for rank in range(args.distinct)]
+        self.traffic = rng.choices(list(self.questions), weights=weights, k=args.queries)
+        self.searches = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def search(self, query: str, k: int = 3):
+        return [("stub chunk", ("stub.pdf", 1, 0), self.questions[query]["distance"])]
+
+    def verifier(self, context: str, query: str) -> bool:
+        time.sleep(self.questions[query]["verifier"])
+        return self.questions[query]["verdict"]
+
+    def web_search(self, query: str, cancelled=None) -> str:
+        with self._lock:
+            self.searches += 1
+        question = self.questions[query]
+        time.sleep(question["search"])
+        if not question["empty"]:
+            return f"snippets for {query}"
+        if cancelled is not None and cancelled.is_set():
+            return ""
+        with self._lock:
+            self.fallbacks += 1
+        time.sleep(question["fallback"])
+        return f"fallback answer for {query}"
+
+
+def run_speculative(args):
+    print(f"{args.queries} queries ({args.distinct} distinct) from {args.clients} clients; "
+          f"{args.ambiguous:.0%} reach the verifier")
+    print(f"{'mode':>12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'searches':>9} {'fallbacks':>10}")
+    answers: Dict[str, List[str]] = {}
+    for mode in ("sequential", "speculative"):
+        scenario = StubScenario(args)
+        AgenticRAG.web_search = scenario.web_search  # used by answer_query when not speculating
+        gate = RelevanceGate(verifier=scenario.verifier)
+        searches = SpeculativeSearch(scenario.web_search, max_workers=args.clients) if mode == "speculative" else None
+
+        def timed(query):
+            start = time.perf_counter()
+            answer = answer_query(query, scenario, gate, searches)
+            return answer, (time.perf_counter() - start) * 1000
+
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            results = list(pool.map(timed, scenario.traffic))
+        answers[mode] = [answer for answer, _ in results]
+        latencies = np.array([ms for _, ms in results])
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        print(f"{mode:>12} {p50:>8.0f} {p95:>8.0f} {p99:>8.0f} {latencies.max():>8.0f} "
+              f"{scenario.searches:>9} {scenario.fallbacks:>10}")
+        if searches is not None:
+            print(f"{'':>12} speculative search: {searches.stats}")
+
+    if answers["sequential"] != answers["speculative"]:
+        raise AssertionError("Speculative answers differ from sequential ones")
+    print("answers identical in both modes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    speculative = sub.add_parser("speculative", help="Tail latency with the web search started alongside the verifier")
+    speculative.add_argument("--queries", type=int, default=400)
+    speculative.add_argument("--distinct", type=int, default=60)
+    speculative.add_argument("--clients", type=int, default=8)
+    speculative.add_argument("--local-relevant", type=float, default=0.4, help="Share decided relevant by distance")
+    speculative.add_argument("--ambiguous", type=float, default=0.4, help="Share escalated to the verifier")
+    speculative.add_argument("--yes-rate", type=float, default=0.5, help="Share of escalations the verifier accepts")
+    speculative.add_argument("--empty-rate", type=float, default=0.3, help="Share of searches with no results")
+    speculative.add_argument("--verifier-delay", type=float, default=0.8)
+    speculative.add_argument("--search-delay", type=float, default=0.6)
+    speculative.add_argument("--fallback-delay", type=float, default=0.8)
+    speculative.set_defaults(func=run_speculative)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
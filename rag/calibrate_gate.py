@@ -0,0 +1,116 @@
+"""Fit AgenticRAG's relevance gate thresholds to labeled questions (see relevance_gate.py).
+
+Usage:
+    python calibrate_gate.py --pdfs a.pdf b.pdf --labels questions.jsonl [--precision 0.95]
+                             [--cross-encoder cross-encoder/ms-marco-MiniLM-L-6-v2] [--llm-labels]
+
+Each line of the labels file is {"query": "...", "relevant": true|false}, where
+relevant means the PDFs answer the question. With --llm-labels, lines without
+"relevant" are labeled by the gpt-4o verifier the gate replaces. The script
+prints the fitted thresholds as environment variables, and a report of how many
+verifier calls they avoid and how often the local decisions agree with the labels.
+"""
+import argparse
+import io
+import json
+import os
+from typing import Dict, List
+
+from AgenticRAG import PDFIndex, is_answer_correct, load_embedding_model
+from relevance_gate import CROSS_ENCODER_MODEL, RelevanceGate, fit_thresholds, load_cross_encoder
+
+
+def load_pdfs(paths: List[str]) -> List[io.BytesIO]:
+    files = []
+    for path in paths:
+        with open(path, "rb") as f:
+            file = io.BytesIO(f.read())
+        file.name = os.path.basename(path)  # PDFIndex expects UploadedFile-like objects
+        files.append(file)
+    return files
+
+
+def load_labels(path: str, pdf_index: PDFIndex, llm_labels: bool) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    for row in rows:
+        row["results"] = pdf_index.search(row["query"])
+        if "relevant" not in row:
+            if not llm_labels:
+                raise ValueError(f"No label for {row['query']!r}; add one or pass --llm-labels")
+            context = "\n".join(chunk for chunk, _, _ in row["results"])
+            row["relevant"] = is_answer_correct(context, row["query"]).strip().lower() == "yes"
+    return rows
+
+
+def evaluate(gate: RelevanceGate, rows: List[Dict]) -> Dict[str, float]:
+    """Replay the labeled questions; the labels stand in for the verifier"""
+    correct = decided = 0
+    for row in rows:
+        relevant, _ = gate.local_decision(row["query"], row["results"])
+        if relevant is not None:
+            decided += 1
+            correct += relevant == row["relevant"]
+        gate.verifier = lambda context, query, label=row["relevant"]: label
+        gate.is_relevant(row["query"], row["results"])
+    report = gate.report()
+    report["local_accuracy"] = correct / decided if decided else 0.0
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdfs", nargs="+", required=True)
+    parser.add_argument("--labels", required=True)
+    parser.add_argument("--precision", type=float, default=0.95,
+                        help="Required share of correct local decisions on each side of the band")
+    parser.add_argument("--cross-encoder", default=CROSS_ENCODER_MODEL)
+    parser.add_argument("--llm-labels", action="store_true")
+    args = parser.parse_args()
+
+    pdf_index = PDFIndex(load_embedding_model())
+    _, errors = pdf_index.add_pdfs(load_pdfs(args.pdfs))
+    if errors:
+        parser.error("; ".join(f"{name}: {error}" for name, error in errors.items()))
+    rows = load_labels(args.labels, pdf_index, args.llm_labels)
+    cross_encoder = load_cross_encoder(args.cross_encoder)
+    positives = sum(row["relevant"] for row in rows)
+    print(f"{len(pdf_index.chunks)} chunks from {len(pdf_index.files)} PDFs, "
+          f"{len(rows)} questions ({positives} answered by the PDFs)")
+
+    distances = [row["results"][0][2] if row["results"] else float("inf") for row in rows]
+    relevant_distance, irrelevant_distance = fit_thresholds(distances, [row["relevant"] for row in rows],
+                                                            args.precision)
+    fitted = RelevanceGate(cross_encoder=cross_encoder, relevant_distance=relevant_distance,
+                           irrelevant_distance=irrelevant_distance)
+    settings = {
+        "RAG_GATE_RELEVANT_DISTANCE": relevant_distance,
+        "RAG_GATE_IRRELEVANT_DISTANCE": irrelevant_distance,
+    }
+
+    if cross_encoder is not None:
+        # The cross-encoder only sees the questions the distances leave undecided
+        ambiguous = [(row, fitted.rerank_score(row["query"], row["results"])) for row, distance in zip(rows, distances)
+                     if relevant_distance < distance < irrelevant_distance]
+        if ambiguous:
+            # Higher logits mean relevant, so fit on negated scores
+            low, high = fit_thresholds([-score for _, score in ambiguous], [row["relevant"] for row, _ in ambiguous],
+                                       args.precision)
+            fitted.rerank_relevant, fitted.rerank_irrelevant = -low, -high
+            settings["RAG_GATE_CROSS_ENCODER"] = args.cross_encoder
+            settings["RAG_GATE_RERANK_RELEVANT"] = fitted.rerank_relevant
+            settings["RAG_GATE_RERANK_IRRELEVANT"] = fitted.rerank_irrelevant
+
+    print(f"{'thresholds':>10} {'distance':>9} {'cross-enc':>10} {'llm':>5} {'avoided':>9} {'local acc':>10}")
+    for name, gate in (("default", RelevanceGate(cross_encoder=cross_encoder)), ("fitted", fitted)):
+        report = evaluate(gate, rows)
+        print(f"{name:>10} {report['distance']:>9} {report['cross-encoder']:>10} {report['llm']:>5} "
+              f"{report['avoided_rate']:>9.0%} {report['local_accuracy']:>10.1%}")
+
+    print()
+    for name, value in settings.items():
+        print(f"{name}={value:.4f}" if isinstance(value, float) else f"{name}={value}")
+
+
+if __name__ == "__main__":
+    main()
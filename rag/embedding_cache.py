@@ -0,0 +1,106 @@
+"""Persistent embedding cache for API-backed embedding models (e.g. OpenAIEmbeddings).
+
+``CachedEmbeddings`` wraps any LangChain ``Embeddings`` and stores document
+vectors in SQLite, keyed by model name plus a SHA-256 of the chunk text. When
+an index is rebuilt (a revised PDF, shared boilerplate pages) only chunks never
+seen before are sent to the API, in concurrent batches.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_CACHE_DB = os.getenv(
+    "RAG_EMBEDDING_CACHE_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".embedding_cache.sqlite")
+)
+API_BATCH_SIZE = 256  # texts per embedding request
+API_WORKERS = 4  # concurrent embedding requests
+SQLITE_MAX_PARAMS = 500  # keys per lookup query
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends cache misses to the underlying model"""
+
+    def __init__(self, underlying: Embeddings, db_path: str = EMBEDDING_CACHE_DB,
+                 batch_size: int = API_BATCH_SIZE, workers: int = API_WORKERS):
+        self.underlying = underlying
+        self.model = getattr(underlying, "model", None) or getattr(underlying, "model_name", type(underlying).__name__)
+        self.batch_size = batch_size
+        self.workers = workers
+        self.stats = {"texts": 0, "hits": 0, "misses": 0, "api_calls": 0, "api_calls_saved": 0}
+        self._stats_lock = threading.Lock()
+
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)")
+        self._db.commit()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._db_lock:
+            for start in range(0, len(keys), SQLITE_MAX_PARAMS):
+                batch = keys[start:start + SQLITE_MAX_PARAMS]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def _store(self, vectors: Dict[str, List[float]]):
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in vectors.items()]
+            )
+            self._db.commit()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        vectors = self._lookup(list(set(keys)))
+
+        # Each distinct missing chunk is embedded once, in concurrent batches
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        batches = [list(missing.items())[start:start + self.batch_size]
+                   for start in range(0, len(missing), self.batch_size)]
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(batches))) as pool:
+                results = pool.map(lambda batch: self.underlying.embed_documents([text for _, text in batch]), batches)
+                fresh = {key: vector for batch, embedded in zip(batches, results)
+                         for (key, _), vector in zip(batch, embedded)}
+            self._store(fresh)
+            vectors.update(fresh)
+
+        uncached_calls = -(-len(texts) // self.batch_size)
+        with self._stats_lock:
+            self.stats["texts"] += len(texts)
+            self.stats["hits"] += len(texts) - len(missing)
+            self.stats["misses"] += len(missing)
+            self.stats["api_calls"] += len(batches)
+            self.stats["api_calls_saved"] += uncached_calls - len(batches)
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        # Questions rarely repeat exactly; only document chunks are cached
+        return self.underlying.embed_query(text)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self.stats)
+
+    @staticmethod
+    def report(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, float]:
+        """Cache statistics between two snapshots, e.g. for one index build"""
+        delta = {name: after[name] - before[name] for name in after}
+        delta["hit_rate"] = delta["hits"] / delta["texts"] if delta["texts"] else 0.0
+        return delta
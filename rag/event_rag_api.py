@@ -0,0 +1,102 @@
+"""Headless HTTP API for the GenAI Event Assistant RAG engine (event_rag_engine.py).
+
+Endpoints:
+    GET  /health                  liveness and loaded events
+    GET  /events                  available event ids
+    POST /query   {"query": "...", "event_id": "default"}
+    POST /batch   {"queries": ["...", ...], "event_id": "default"}
+
+Answers keep the app's (text, type) contract as {"text": ..., "type": ...} and carry
+timing metadata in milliseconds.
+
+Run:
+    python event_rag_api.py [--host 0.0.0.0] [--port 8000]
+or behind a process manager, e.g. gunicorn -w 2 --threads 8 event_rag_api:app
+"""
+import argparse
+import os
+import time
+
+from flask import Flask, jsonify, request
+
+from event_rag_engine import DEFAULT_EVENT_ID, get_event_registry
+
+# Largest accepted batch; bigger jobs should be split by the client
+MAX_BATCH_SIZE = int(os.getenv("EVENT_RAG_MAX_BATCH", "64"))
+
+app = Flask(__name__)
+
+
+def _resolve_system(payload: dict):
+    """The event's RAG system, or an error response for unknown events"""
+    event_id = payload.get("event_id") or DEFAULT_EVENT_ID
+    try:
+        return event_id, get_event_registry().get(event_id), None
+    except KeyError:
+        return event_id, None, (jsonify({"error": f"Unknown event: {event_id}"}), 404)
+
+
+@app.route("/health", methods=["GET"])
+def health():
+    return jsonify({"status": "ok", "loaded_events": get_event_registry().loaded()})
+
+
+@app.route("/events", methods=["GET"])
+def events():
+    return jsonify({"events": get_event_registry().event_ids()})
+
+
+@app.route("/query", methods=["POST"])
+def query():
+    payload = request.get_json(silent=True) or {}
+    text = payload.get("query")
+    if not isinstance(text, str) or not text.strip():
+        return jsonify({"error": "'query' must be a non-empty string"}), 400
+
+    start = time.perf_counter()
+    event_id, system, error = _resolve_system(payload)
+    if error:
+        return error
+    load_ms = (time.perf_counter() - start) * 1000
+
+    response, response_type = system.get_response(text.strip())
+    return jsonify({
+        "event_id": event_id,
+        "text": response,
+        "type": response_type,
+        "timing": {"load_ms": load_ms, "total_ms": (time.perf_counter() - start) * 1000},
+    })
+
+
+@app.route("/batch", methods=["POST"])
+def batch():
+    payload = request.get_json(silent=True) or {}
+    queries = payload.get("queries")
+    if (not isinstance(queries, list) or not queries
+            or not all(isinstance(q, str) and q.strip() for q in queries)):
+        return jsonify({"error": "'queries' must be a non-empty list of non-empty strings"}), 400
+    if len(queries) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} queries per batch"}), 413
+
+    start = time.perf_counter()
+    event_id, system, error = _resolve_system(payload)
+    if error:
+        return error
+    load_ms = (time.perf_counter() - start) * 1000
+
+    responses, timing = system.get_responses([q.strip() for q in queries])
+    return jsonify({
+        "event_id": event_id,
+        "results": [{"text": response, "type": response_type} for response, response_type in responses],
+        "timing": {"load_ms": load_ms, **timing, "total_ms": (time.perf_counter() - start) * 1000},
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Event RAG HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    get_event_registry().get(DEFAULT_EVENT_ID)  # load the default event before serving
+    app.run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,708 @@
+"""Benchmarks and load checks for the GenAI Event Assistant engine (event_rag_engine.py).
+
+Usage:
+    python event_rag_bench.py sessions [--levels 1 5 10 25 50] [--mode shared|per-session]
+    python event_rag_bench.py router [--queries 5000]
+    python event_rag_bench.py schedule [--repeat 1000]
+    python event_rag_bench.py fanout [--delays 0.2 1 5] [--deadline 2]
+    python event_rag_bench.py stream [--token-delay 0.02]
+    python event_rag_bench.py retrieval [--k 1 3 4 6]
+    python event_rag_bench.py replay [--queries-file FILE] [--llm-delay 0.3] [--search-delay 0.8] [--context-tokens 1200] [--json OUT]
+    python event_rag_bench.py embeddings [--backends torch onnx onnx-int8]
+    python event_rag_bench.py batch [--size 32] [--llm-delay 0.3]
+    python event_rag_bench.py search [--delay 0.3] [--timeout 0.5]
+    python event_rag_bench.py events [--events 50] [--memory-cap-mb 4] [--accesses 500]
+"""
+import argparse
+import gc
+import os
+import random
+import resource
+import shutil
+import tempfile
+import threading
+import time
+from typing import List
+
+import numpy as np
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.language_models.fake import FakeListLLM, FakeStreamingListLLM
+from resilient_search import CircuitOpen, ResilientSearch, SearchTimeout
+
+import event_rag_engine
+from event_rag_engine import (
+    CONTEXT_TOKEN_BUDGET,
+    EMBEDDING_MODEL_NAME,
+    EXTERNAL_KEYWORDS,
+    NAVIGATION_KEYWORDS,
+    QUICK_ACTIONS,
+    EnhancedEventRAGSystem,
+    EventRegistry,
+    QueryRouter,
+    get_shared_rag_system,
+)
+
+SAMPLE_QUERIES = [
+    "What is the detailed schedule for both days?",
+    "How to reach the venue from Guindy? Include all transport options.",
+    "What are the parking arrangements and entry requirements?",
+    "Tell me about the venue location and facilities",
+]
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        # Not Linux - fall back to peak RSS (KB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if peak > 1 << 30 else peak / 1024
+
+
+# ===== Concurrent sessions =====
+def simulate_sessions(n_sessions: int, mode: str, keep_alive: List[EnhancedEventRAGSystem]):
+    """Run n_sessions concurrent "browser tabs", each doing a few searches"""
+    errors = []
+
+    def session():
+        try:
+            if mode == "shared":
+                system = get_shared_rag_system()
+            else:
+                system = EnhancedEventRAGSystem()
+                keep_alive.append(system)
+            for query in SAMPLE_QUERIES:
+                system.vectorstore.similarity_search(query, k=4)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=session) for _ in range(n_sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise RuntimeError(f"{len(errors)} session(s) failed, first error: {errors[0]}")
+
+
+def run_sessions(args):
+    keep_alive: List[EnhancedEventRAGSystem] = []
+    baseline = current_rss_mb()
+    print(f"mode={args.mode} baseline RSS={baseline:.1f} MB")
+    print(f"{'sessions':>8} {'RSS MB':>10} {'delta MB':>10} {'seconds':>8}")
+
+    for level in args.levels:
+        start = time.perf_counter()
+        simulate_sessions(level, args.mode, keep_alive)
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        rss = current_rss_mb()
+        print(f"{level:>8} {rss:>10.1f} {rss - baseline:>10.1f} {elapsed:>8.2f}")
+
+    if args.mode == "shared":
+        print(f"instances built: {event_rag_engine.get_event_registry().loads}")
+    else:
+        print(f"instances built: {len(keep_alive)}")
+
+
+# ===== Intent routing =====
+FILLER_WORDS = [
+    "what", "is", "the", "schedule", "for", "day", "lunch", "venue", "hall", "laptop",
+    "wifi", "hackathon", "team", "please", "tell", "me", "about", "registration",
+    "chennai", "tharamani", "event", "when", "does", "start", "business", "automatic",
+]
+
+
+def synthetic_queries(n: int, seed: int = 7) -> List[str]:
+    """Mix of plain event questions and ones containing routing keywords"""
+    rng = random.Random(seed)
+    keywords = NAVIGATION_KEYWORDS + EXTERNAL_KEYWORDS
+    queries = []
+    for _ in range(n):
+        words = rng.choices(FILLER_WORDS, k=rng.randint(4, 12))
+        if rng.random() < 0.5:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords).upper())
+        queries.append(" ".join(words) + "?")
+    return queries
+
+
+def legacy_route(query: str):
+    """The original per-call linear keyword scans"""
+    query_lower = query.lower()
+    is_navigation = any(keyword in query_lower for keyword in NAVIGATION_KEYWORDS)
+    query_lower = query.lower()
+    is_external = any(keyword in query_lower for keyword in EXTERNAL_KEYWORDS)
+    return is_navigation, is_external
+
+
+def run_router(args):
+    queries = synthetic_queries(args.queries)
+    router = QueryRouter()
+
+    for query in queries:
+        decision = router.route(query)
+        if (decision.is_navigation, decision.is_external) != legacy_route(query):
+            raise AssertionError(f"Router disagrees with keyword scan for: {query!r}")
+
+    def timed(fn) -> float:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for query in queries:
+                fn(query)
+            best = min(best, time.perf_counter() - start)
+        return best / len(queries) * 1e6
+
+    legacy_us = timed(legacy_route)
+    router_us = timed(router.route)
+    print(f"{len(queries)} synthetic queries, best of {args.repeat} runs (decisions identical)")
+    print(f"legacy keyword scans : {legacy_us:6.2f} us per classification")
+    print(f"QueryRouter          : {router_us:6.2f} us per classification")
+    # get_response used to re-scan up to 5 times per request; the router runs once
+    print(f"worst-case request (5 legacy scans vs 1 route): {5 * legacy_us:6.2f} us -> {router_us:6.2f} us")
+
+
+# ===== Schedule fast path =====
+# (query, text the schedule answer must contain, or None if it must not be answered)
+SCHEDULE_QUERIES = [
+    ("what happens at 12:45", "Lunch"),
+    ("what is on at 2 pm on day 1", "02:00 PM"),
+    ("what's happening at 10:30am?", "10:30 AM"),
+    ("what is at 3 p.m. on day two", "03:00 PM"),
+    # Numbers followed by words starting with am/pm are not times
+    ("What are the top 3 amenities at the hall?", None),
+    ("List 10 amazing features of the venue", None),
+    ("Do I need 2 pmt passes?", None),
+    ("Is there parking for 4 ambulances?", None),
+    ("What is the detailed schedule for both days?", None),
+    # Times and "next" outside a schedule lookup go to retrieval
+    ("What is next to the venue?", None),
+    ("What's next door to the hall?", None),
+    ("Is the food court open, 9 pm?", None),
+    ("Event ends at 4:30 PM?", None),
+]
+
+
+def run_schedule(args):
+    schedule_index = get_shared_rag_system().schedule_index
+    for query, expected in SCHEDULE_QUERIES:
+        answer = schedule_index.answer(query)
+        if expected is None and answer is not None:
+            raise AssertionError(f"Schedule fast path answered a non-schedule query: {query!r}")
+        if expected is not None and (answer is None or expected not in answer):
+            raise AssertionError(f"Schedule answer for {query!r} lacks {expected!r}: {answer!r}")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for query, _ in SCHEDULE_QUERIES:
+            schedule_index.answer(query)
+    per_query_us = (time.perf_counter() - start) / (args.repeat * len(SCHEDULE_QUERIES)) * 1e6
+    print(f"{len(SCHEDULE_QUERIES)} schedule queries ({sum(e is None for _, e in SCHEDULE_QUERIES)} negative) "
+          f"answered as expected, {per_query_us:.1f} us each")
+
+
+# ===== Local + live search fan-out =====
+class SlowSearchStub:
+    """Stands in for SerpAPIWrapper with a fixed response delay"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def run(self, query: str) -> str:
+        time.sleep(self.delay)
+        return f"[stub live result after {self.delay:.1f}s] {query}"
+
+
+def run_fanout(args):
+    system = get_shared_rag_system()
+    query = "How to reach the venue from Guindy? Include all transport options."
+    original = (system.search, system.concurrent_search, system.search_deadline)
+    system.search_deadline = args.deadline
+
+    print(f"deadline={args.deadline}s, query={query!r}")
+    print(f"{'delay s':>8} {'mode':>11} {'latency s':>10} {'live':>6}")
+    try:
+        for delay in args.delays:
+            system.search = SlowSearchStub(delay)
+            for concurrent in (False, True):
+                system.concurrent_search = concurrent
+                start = time.perf_counter()
+                response, _ = system.get_response(query)
+                elapsed = time.perf_counter() - start
+                live = "stub live result" in response
+                mode = "concurrent" if concurrent else "sequential"
+                print(f"{delay:>8.1f} {mode:>11} {elapsed:>10.2f} {str(live):>6}")
+                if concurrent:
+                    assert elapsed < args.deadline + 0.5, "deadline not enforced"
+                    assert live == (delay < args.deadline), "live results handled incorrectly"
+    finally:
+        system.search, system.concurrent_search, system.search_deadline = original
+
+
+# ===== Streaming answers =====
+FAKE_ANSWER = (
+    "Day 1 starts with registration at 08:30 AM, followed by revision and doubt clearing "
+    "until 12:30 PM, the hackathon introduction, lunch at 12:45 PM and design and "
+    "development from 02:00 PM to 04:30 PM."
+)
+
+
+def run_stream(args):
+    # FakeStreamingListLLM streams one character at a time, sleeping between them
+    llm = FakeStreamingListLLM(responses=[FAKE_ANSWER], sleep=args.token_delay)
+    # The query is also a quick action; once warmed it would be served precomputed, not streamed
+    event_rag_engine.WARM_QUICK_ACTIONS = False
+    system = EnhancedEventRAGSystem(llm=llm)
+    query = "What is the detailed schedule for both days?"
+    assert system.supports_streaming(query)
+
+    start = time.perf_counter()
+    first_chunk = first_token = None
+    chunks = []
+    for chunk in system.stream_response(query):
+        now = time.perf_counter() - start
+        if first_chunk is None:
+            first_chunk = now
+        elif first_token is None:
+            first_token = now
+        chunks.append(chunk)
+    total = time.perf_counter() - start
+
+    assert FAKE_ANSWER in "".join(chunks)
+    print(f"header after    : {first_chunk * 1000:8.1f} ms")
+    print(f"first LLM token : {first_token * 1000:8.1f} ms")
+    # A blocking call shows nothing until the whole completion has arrived
+    print(f"stream complete : {total * 1000:8.1f} ms ({len(chunks)} chunks)")
+
+
+# ===== Dense vs hybrid retrieval =====
+# (query, text that a relevant chunk must contain)
+LABELED_QUERIES = [
+    ("what happens at 12:45", "12:45 PM - 02:00 PM: Lunch Break"),
+    ("route 570", "Route 570: Koyambedu"),
+    ("842 842 6700", "Emergency contact: 842 842 6700"),
+    ("which bus is 27B", "Route 27B: Egmore"),
+    ("what is the pincode 600113", "Chennai - 600113"),
+    ("GPS coordinates of the venue", "GPS Coordinates"),
+    ("hashtags to use on social media", "#flyhighwithai"),
+    ("is a laptop mandatory", "Laptop is MANDATORY"),
+    ("when does registration start", "Registration & Networking"),
+    ("closing ceremony time on day 2", "Final Review and Closing Ceremony"),
+    ("taxi fare from the airport", "Taxi fare: ₹300-400"),
+    ("auto fare from velachery", "Auto fare: ₹60-80"),
+    ("is there wifi in the hall", "High-speed WiFi"),
+    ("where can I get food", "Food court and cafeteria"),
+    ("how long from Sholinganallur", "From Sholinganallur: 15 minutes"),
+    ("blue line metro station", "Blue Line"),
+]
+
+
+def run_retrieval(args):
+    system = get_shared_rag_system()
+    original_mode = system.retrieval_mode
+
+    print(f"{len(LABELED_QUERIES)} labeled queries")
+    print(f"{'mode':>7} " + " ".join(f"{'R@' + str(k):>6}" for k in args.k) + f" {'ms/query':>9} {'gated low':>10}")
+    try:
+        for mode in ("dense", "hybrid"):
+            system.retrieval_mode = mode
+            system._result_cache.clear()
+            max_k = max(args.k)
+            hits = {k: 0 for k in args.k}
+            start = time.perf_counter()
+            for query, expected in LABELED_QUERIES:
+                if mode == "hybrid":
+                    docs = system.hybrid_search(query, k=max_k)
+                else:
+                    docs = system.cached_similarity_search(query, k=max_k)
+                for k in args.k:
+                    if any(expected in doc.page_content for doc in docs[:k]):
+                        hits[k] += 1
+            elapsed = (time.perf_counter() - start) / len(LABELED_QUERIES) * 1000
+            recalls = " ".join(f"{hits[k] / len(LABELED_QUERIES):>6.2f}" for k in args.k)
+            # Every labeled query is answerable, so each one gated "low" is a wrong "not found"
+            gated_low = sum(system.confidence_band(query)[0] == "low" for query, _ in LABELED_QUERIES)
+            print(f"{mode:>7} {recalls} {elapsed:>9.2f} {gated_low:>10}")
+    finally:
+        system.retrieval_mode = original_mode
+        system._result_cache.clear()
+
+
+# ===== Per-stage latency replay =====
+def load_replay_queries(path: str, n_synthetic: int) -> List[str]:
+    """Quick-action queries plus one query per non-empty line of the file (or synthetic ones)"""
+    queries = [query for _, _, query in QUICK_ACTIONS]
+    if path:
+        with open(path, encoding="utf-8") as f:
+            queries += [line.strip() for line in f if line.strip()]
+    else:
+        queries += synthetic_queries(n_synthetic)
+    return queries
+
+
+def run_replay(args):
+    queries = load_replay_queries(args.queries_file, args.synthetic)
+    llm = FakeListLLM(responses=[FAKE_ANSWER], sleep=args.llm_delay)
+    system = EnhancedEventRAGSystem(llm=llm)
+    system.search = SlowSearchStub(args.search_delay)
+    system.search_deadline = args.deadline
+    system.context_budget = args.context_tokens
+    # Precompute the quick actions for this configuration first, as the app does at startup
+    system.warm_quick_actions()
+    system.wait_for_quick_actions()
+    system.metrics.reset()
+    system.gate_decisions.clear()
+    system.context_tokens.clear()
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for query in queries:
+            system.get_response(query)
+    elapsed = time.perf_counter() - start
+
+    summary = system.metrics.summary()
+    print(f"{len(queries) * args.repeat} queries in {elapsed:.1f}s "
+          f"(stub LLM {args.llm_delay}s, stub search {args.search_delay}s)")
+    print(f"{'stage':>16} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for stage, stats in summary.items():
+        print(f"{stage:>16} {stats['count']:>6} {stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['p99']:>9.2f}")
+
+    decisions = system.gate_decisions
+    gated = sum(decisions.values())
+    if gated:
+        avoided = gated - decisions.get("middle", 0)
+        print(f"confidence gate: {decisions} -> {avoided}/{gated} LLM calls avoided ({avoided / gated:.0%})")
+
+    savings = system.context_savings()
+    if savings:
+        print(f"context packing: {savings['raw_tokens']} -> {savings['packed_tokens']} prompt tokens, "
+              f"{savings['saved_per_query']} saved per LLM query (budget {system.context_budget})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(system.metrics.to_json())
+        print(f"wrote {args.json}")
+
+
+# ===== Embedding backends =====
+# Minimum cosine similarity to the torch vectors for the parity check
+PARITY_THRESHOLDS = {"onnx": 0.999, "onnx-int8": 0.97}
+
+
+def load_backend(backend: str):
+    if backend == "torch":
+        return HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME, model_kwargs={'device': 'cpu'})
+    from onnx_embeddings import ONNXMiniLMEmbeddings
+
+    return ONNXMiniLMEmbeddings(quantized=backend == "onnx-int8")
+
+
+def run_embeddings(args):
+    system = get_shared_rag_system()
+    chunks = [doc.page_content for doc in EnhancedEventRAGSystem._indexed_documents(system.vectorstore)]
+    queries = [query for _, _, query in QUICK_ACTIONS] + [query for query, _ in LABELED_QUERIES]
+    texts = chunks + queries
+
+    print(f"{len(chunks)} corpus chunks, {len(queries)} queries")
+    print(f"{'backend':>10} {'load s':>7} {'RSS +MB':>8} {'build ms':>9} {'query ms':>9} {'min cos':>8} {'mean cos':>9}")
+    reference = None
+    for backend in args.backends:
+        rss_before = current_rss_mb()
+        start = time.perf_counter()
+        embeddings = load_backend(backend)
+        load_seconds = time.perf_counter() - start
+        embeddings.embed_query("warm up")
+        rss_delta = current_rss_mb() - rss_before
+
+        start = time.perf_counter()
+        FAISS.from_texts(chunks, embeddings)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for query in queries:
+                embeddings.embed_query(query)
+        query_ms = (time.perf_counter() - start) * 1000 / (args.repeat * len(queries))
+
+        vectors = np.array(embeddings.embed_documents(texts))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        if backend == "torch":
+            reference = vectors
+        min_cos = mean_cos = float("nan")
+        if reference is not None:
+            cosines = (vectors * reference).sum(axis=1)
+            min_cos, mean_cos = float(cosines.min()), float(cosines.mean())
+            threshold = PARITY_THRESHOLDS.get(backend)
+            if threshold and min_cos < threshold:
+                raise AssertionError(f"{backend} parity failed: min cosine {min_cos:.4f} < {threshold}")
+        print(f"{backend:>10} {load_seconds:>7.2f} {rss_delta:>8.1f} {build_ms:>9.1f} "
+              f"{query_ms:>9.2f} {min_cos:>8.4f} {mean_cos:>9.4f}")
+
+
+# ===== Batched queries =====
+def run_batch(args):
+    queries = [query for query, _ in LABELED_QUERIES] + synthetic_queries(args.size)
+    queries = queries[:args.size]
+    system = EnhancedEventRAGSystem(llm=FakeListLLM(responses=[FAKE_ANSWER], sleep=args.llm_delay))
+    system.search = SlowSearchStub(args.search_delay)
+
+    def clear_caches():
+        system._vector_cache.clear()
+        system._result_cache.clear()
+
+    clear_caches()
+    start = time.perf_counter()
+    sequential = [system.get_response(query) for query in queries]
+    sequential_s = time.perf_counter() - start
+
+    clear_caches()
+    batched, timing = system.get_responses(queries)
+    if batched != sequential:
+        raise AssertionError("batched answers differ from sequential ones")
+    print(f"{len(queries)} queries (stub LLM {args.llm_delay}s, stub search {args.search_delay}s)")
+    print(f"  sequential: {sequential_s * 1000:>9.1f} ms")
+    print(f"     batched: {timing['total_ms']:>9.1f} ms (embedding {timing.get('embedding_ms', 0):.1f} ms, "
+          f"faiss {timing.get('faiss_search_ms', 0):.1f} ms, answers {timing['answer_ms']:.1f} ms)")
+
+
+# ===== Resilient live search =====
+class FakeSearchBackend:
+    """Local stand-in for SerpAPI: fixed latency, switchable outage, counted calls"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.failing = False
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def run(self, query: str) -> str:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.failing:
+            raise ConnectionError("fake SerpAPI outage")
+        return f"[fake live result] {query}"
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    try:
+        result = fn(*args)
+    except Exception as e:
+        result = e
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_search(args):
+    backend = FakeSearchBackend(args.delay)
+    workdir = tempfile.mkdtemp(prefix="event_rag_search_")
+    db_path = os.path.join(workdir, "search.sqlite")
+    try:
+        search = ResilientSearch(backend, ttl=60, timeout=args.timeout, failure_threshold=3,
+                                 reset_after=args.reset_after, db_path=db_path)
+
+        # TTL cache: repeats within the TTL (any case/spacing) never reach the backend
+        for query in ["current weather Chennai", "Current  weather chennai"] * 10:
+            search.run(query)
+        print(f"cache: 20 lookups -> {backend.calls} backend call")
+        assert backend.calls == 1
+
+        # Coalescing: concurrent identical queries share one call
+        backend.calls = 0
+        threads = [threading.Thread(target=search.run, args=("traffic Tharamani now",)) for _ in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        print(f"coalescing: 16 concurrent lookups -> {backend.calls} backend call")
+        assert backend.calls == 1
+
+        # SQLite: a fresh instance (e.g. another worker process) reuses stored results
+        backend.calls = 0
+        ResilientSearch(backend, ttl=60, timeout=args.timeout, db_path=db_path).run("current weather Chennai")
+        print(f"sqlite: new instance lookup -> {backend.calls} backend calls")
+        assert backend.calls == 0
+
+        # Hard timeout on a slow backend
+        backend.delay = args.timeout * 4
+        error, ms = timed(search.run, "slow hotel search")
+        print(f"timeout: {type(error).__name__} after {ms:.0f} ms (backend takes {backend.delay * 1000:.0f} ms)")
+        assert isinstance(error, SearchTimeout)
+        time.sleep(backend.delay)  # the late result still lands in the cache
+        backend.calls = 0
+        search.run("slow hotel search")
+        print(f"timeout: late result cached -> {backend.calls} backend calls on retry")
+        assert backend.calls == 0
+
+        # Circuit breaker: consecutive failures open it, then calls fail fast without the backend
+        backend.delay, backend.failing = args.delay, True
+        for i in range(3):
+            timed(search.run, f"outage query {i}")
+        print(f"breaker after 3 failures: {search.breaker.state}")
+        assert search.breaker.state == "open"
+        backend.calls = 0
+        errors = [timed(search.run, f"new query {i}") for i in range(20)]
+        worst = max(ms for _, ms in errors)
+        print(f"open circuit: 20 lookups, {backend.calls} backend calls, slowest {worst:.2f} ms")
+        assert backend.calls == 0 and all(isinstance(error, CircuitOpen) for error, _ in errors)
+
+        # Half-open trial after the reset period closes it again once the backend recovers
+        time.sleep(args.reset_after)
+        backend.failing = False
+        search.run("recovery probe")
+        print(f"after {args.reset_after}s and a successful trial: {search.breaker.state}")
+        assert search.breaker.state == "closed"
+
+        # End to end: during an outage the app answers from built-in data, at once after the circuit opens
+        system = get_shared_rag_system()
+        original = system.search
+        backend.failing = True
+        system.search = search
+        try:
+            outage_queries = ["What is the current weather in Chennai?", "live traffic from Guindy to the venue",
+                              "hotels near the venue with current prices"]
+            for query in outage_queries * 2:
+                (response, response_type), ms = timed(system.get_response, query)
+                print(f"app during outage: {response_type:>10} in {ms:>7.1f} ms <- {query!r}")
+        finally:
+            system.search = original
+        print(f"stats: {search.stats}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ===== Multi-event registry =====
+def write_synthetic_events(events_dir: str, n_events: int, doc_kb: int, seed: int = 11):
+    """One directory per event holding a guidelines file of roughly doc_kb kilobytes"""
+    rng = random.Random(seed)
+    for i in range(n_events):
+        event_dir = os.path.join(events_dir, f"event-{i:03d}")
+        os.makedirs(event_dir)
+        lines = []
+        while sum(len(line) for line in lines) < doc_kb * 1024:
+            lines.append(" ".join(rng.choices(FILLER_WORDS, k=12)) + ".")
+        with open(os.path.join(event_dir, "guidelines.md"), "w", encoding="utf-8") as f:
+            f.write(f"# Event {i}\n\n" + "\n".join(lines))
+
+
+def run_events(args):
+    workdir = tempfile.mkdtemp(prefix="event_rag_events_")
+    events_dir = os.path.join(workdir, "events")
+    event_rag_engine.INDEX_CACHE_DIR = os.path.join(workdir, "cache")
+    try:
+        write_synthetic_events(events_dir, args.events, args.doc_kb)
+        event_ids = [f"event-{i:03d}" for i in range(args.events)]
+
+        # Build every index once so the access phase only loads from disk
+        builder = EventRegistry(events_dir=events_dir, memory_cap_mb=0)
+        start = time.perf_counter()
+        for event_id in event_ids:
+            builder.get(event_id)
+        print(f"built {args.events} event indexes in {time.perf_counter() - start:.1f}s")
+
+        registry = EventRegistry(events_dir=events_dir, memory_cap_mb=args.memory_cap_mb)
+        registry.embeddings = builder.embeddings
+        del builder
+        gc.collect()
+        baseline = current_rss_mb()
+
+        # Zipf-like traffic: a few popular events, a long tail of rare ones
+        rng = random.Random(3)
+        weights = [1 / (rank + 1) for rank in range(args.events)]
+        hits, misses = [], []
+        for event_id in rng.choices(event_ids, weights=weights, k=args.accesses):
+            loaded = event_id in registry.loaded()
+            start = time.perf_counter()
+            registry.get(event_id).cached_similarity_search("what is the schedule", k=4)
+            (hits if loaded else misses).append((time.perf_counter() - start) * 1000)
+
+        resident = sum(registry.get(event_id).memory_bytes() for event_id in registry.loaded()) / 2**20
+        print(f"{args.accesses} accesses, cap {args.memory_cap_mb} MB: {len(registry.loaded())} resident "
+              f"({resident:.1f} MB indexes), {registry.loads} loads, {registry.evictions} evictions, "
+              f"RSS +{current_rss_mb() - baseline:.1f} MB")
+        for label, samples in (("resident", hits), ("load from disk", misses)):
+            if samples:
+                samples.sort()
+                print(f"{label:>16}: {len(samples):>5} requests, p50 {samples[len(samples) // 2]:.2f} ms, "
+                      f"max {samples[-1]:.2f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event RAG benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sessions = sub.add_parser("sessions", help="RSS as simulated sessions increase")
+    sessions.add_argument("--levels", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    sessions.add_argument("--mode", choices=["shared", "per-session"], default="shared")
+    sessions.set_defaults(func=run_sessions)
+
+    router = sub.add_parser("router", help="Micro-benchmark of intent classification")
+    router.add_argument("--queries", type=int, default=5000)
+    router.add_argument("--repeat", type=int, default=5)
+    router.set_defaults(func=run_router)
+
+    schedule = sub.add_parser("schedule", help="Schedule fast-path answers, including non-time queries")
+    schedule.add_argument("--repeat", type=int, default=1000)
+    schedule.set_defaults(func=run_schedule)
+
+    fanout = sub.add_parser("fanout", help="Navigation latency with a stubbed slow search")
+    fanout.add_argument("--delays", type=float, nargs="+", default=[0.2, 1.0, 5.0])
+    fanout.add_argument("--deadline", type=float, default=2.0)
+    fanout.set_defaults(func=run_fanout)
+
+    stream = sub.add_parser("stream", help="Time-to-first-token with a fake streaming LLM")
+    stream.add_argument("--token-delay", type=float, default=0.02)
+    stream.set_defaults(func=run_stream)
+
+    retrieval = sub.add_parser("retrieval", help="Recall@k and latency, dense vs hybrid")
+    retrieval.add_argument("--k", type=int, nargs="+", default=[1, 3, 4, 6])
+    retrieval.set_defaults(func=run_retrieval)
+
+    replay = sub.add_parser("replay", help="Per-stage percentiles with stubbed LLM and search")
+    replay.add_argument("--queries-file", help="newline-separated queries (default: synthetic)")
+    replay.add_argument("--synthetic", type=int, default=200, help="synthetic queries without a file")
+    replay.add_argument("--repeat", type=int, default=1)
+    replay.add_argument("--llm-delay", type=float, default=0.3)
+    replay.add_argument("--search-delay", type=float, default=0.8)
+    replay.add_argument("--deadline", type=float, default=2.5)
+    replay.add_argument("--context-tokens", type=int, default=CONTEXT_TOKEN_BUDGET,
+                        help="context token budget (0 = merge and de-duplicate only)")
+    replay.add_argument("--json", help="write the percentiles as JSON to this path")
+    replay.set_defaults(func=run_replay)
+
+    embeddings = sub.add_parser("embeddings", help="torch vs ONNX parity, latency and index build time")
+    embeddings.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    embeddings.add_argument("--repeat", type=int, default=5)
+    embeddings.set_defaults(func=run_embeddings)
+
+    batch = sub.add_parser("batch", help="Sequential answers vs one batched call")
+    batch.add_argument("--size", type=int, default=32)
+    batch.add_argument("--llm-delay", type=float, default=0.3)
+    batch.add_argument("--search-delay", type=float, default=0.8)
+    batch.set_defaults(func=run_batch)
+
+    search = sub.add_parser("search", help="Search cache, coalescing, timeout and circuit breaker on a fake backend")
+    search.add_argument("--delay", type=float, default=0.3, help="fake backend latency")
+    search.add_argument("--timeout", type=float, default=0.5)
+    search.add_argument("--reset-after", type=float, default=1.0)
+    search.set_defaults(func=run_search)
+
+    events = sub.add_parser("events", help="Lazy loading and LRU eviction across many events")
+    events.add_argument("--events", type=int, default=50)
+    events.add_argument("--doc-kb", type=int, default=20, help="corpus size per event")
+    events.add_argument("--memory-cap-mb", type=float, default=4)
+    events.add_argument("--accesses", type=int, default=500)
+    events.set_defaults(func=run_events)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1966 @@
+"""RAG engine of the GenAI Event Assistant, free of any UI.
+
+The Streamlit app (event_rag_app.py), the HTTP API (event_rag_api.py) and the
+benchmarks (event_rag_bench.py) all run on the classes here. Failures are
+logged and reflected in the system's state (e.g. ``embeddings`` or ``qa_chain``
+left as None) for the front end to display.
+"""
+import os
+import re
+import math
+import bisect
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, field
+from functools import lru_cache
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from typing import Any, Callable, Iterable, Iterator, Tuple, Optional, List, Dict
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain.chains import RetrievalQA
+from langchain.chains.retrieval_qa.prompt import PROMPT as QA_PROMPT
+from langchain_core.language_models import BaseLanguageModel
+from langchain_community.llms import OpenAI
+from langchain_community.utilities import SerpAPIWrapper
+from dotenv import load_dotenv
+from resilient_search import ResilientSearch, SearchUnavailable
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Load environment variablesstrea
+load_dotenv()
+
+# Embedding / chunking settings - part of the index cache key
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+# torch (sentence-transformers), onnx or onnx-int8 (see onnx_embeddings.py)
+EMBEDDING_BACKEND = os.getenv("RAG_EMBEDDING_BACKEND", "torch")
+CHUNK_SIZE = 1500  # Increased chunk size for better context
+CHUNK_OVERLAP = 300
+
+# Local directory holding the persisted FAISS index
+INDEX_CACHE_DIR = os.getenv(
+    "EVENT_RAG_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".rag_cache")
+)
+
+# Navigation queries run the local lookup and SerpAPI concurrently; live results
+# arriving after the deadline (seconds) are ignored
+CONCURRENT_SEARCH = os.getenv("EVENT_RAG_CONCURRENT_SEARCH", "1") != "0"
+SEARCH_DEADLINE_SECONDS = float(os.getenv("EVENT_RAG_SEARCH_DEADLINE", "2.5"))
+
+# Shared pool for live search calls; late calls finish here and are discarded
+_search_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="event-rag-search")
+
+# Live search results are cached per query for EVENT_RAG_SEARCH_TTL seconds (also in the
+# optional SQLite file, shared across processes). Calls give up after the timeout, and
+# repeated failures open a circuit breaker so answers fall back to built-in data at once.
+SEARCH_CACHE_TTL = float(os.getenv("EVENT_RAG_SEARCH_TTL", "600"))
+SEARCH_TIMEOUT_SECONDS = float(os.getenv("EVENT_RAG_SEARCH_TIMEOUT", "5"))
+SEARCH_CACHE_DB = os.getenv("EVENT_RAG_SEARCH_CACHE_DB")
+_live_search: Optional[ResilientSearch] = None
+_live_search_lock = threading.Lock()
+
+# Quick-action answers are computed in the background once the index is loaded and
+# persisted next to it; set EVENT_RAG_WARM_QUICK_ACTIONS=0 to disable
+WARM_QUICK_ACTIONS = os.getenv("EVENT_RAG_WARM_QUICK_ACTIONS", "1") != "0"
+_warm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-rag-warm")
+
+# Cache entry name of the combined index; partitions are named after metadata['type']
+ALL_DOCUMENTS = "_all"
+MANIFEST_FILE = "manifest.json"
+# Document types name partition directories, so they are never paths
+DOC_TYPE_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+# Optional directory of markdown/text/JSON event documents replacing the built-in data
+CORPUS_DIR = os.getenv("EVENT_RAG_CORPUS_DIR")
+CORPUS_EXTENSIONS = (".md", ".markdown", ".txt", ".json")
+
+# Multi-event deployments: every subdirectory of EVENT_RAG_EVENTS_DIR is one event's
+# corpus, selected by its directory name. The built-in event is always available as
+# DEFAULT_EVENT_ID. Loaded events are evicted least-recently-used above the memory cap.
+EVENTS_DIR = os.getenv("EVENT_RAG_EVENTS_DIR")
+EVENT_MEMORY_CAP_MB = float(os.getenv("EVENT_RAG_MEMORY_CAP_MB", "512"))
+DEFAULT_EVENT_ID = "default"
+EVENT_ID_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*")
+
+# Bounded cross-request caches for frequent queries (e.g. the quick-action buttons)
+QUERY_CACHE_SIZE = 256
+
+# "hybrid" fuses BM25 and dense rankings with reciprocal rank fusion; "dense" is FAISS only.
+# Exact-token matches (times, route numbers, phone numbers) rank well in hybrid mode,
+# so the QA prompt needs fewer chunks.
+RETRIEVAL_MODE = os.getenv("EVENT_RAG_RETRIEVAL_MODE", "hybrid")
+QA_TOP_K = {"hybrid": 4, "dense": 6}
+HYBRID_CANDIDATES = 10  # per-ranker candidates fed into the fusion
+RRF_K = 60
+
+# Batched queries: every top-k the answer paths ask for, seeded from one matrix
+# search per index, and the number of answers computed in parallel
+BATCH_SEARCH_KS = {ALL_DOCUMENTS: (1, 5, *QA_TOP_K.values(), HYBRID_CANDIDATES), "navigation": (2,)}
+BATCH_WORKERS = int(os.getenv("EVENT_RAG_BATCH_WORKERS", "8"))
+
+# Retrieval-confidence gate on the top chunk's cosine similarity: at or above HIGH the
+# answer is extracted from that chunk, below LOW the query skips to navigation/external
+# search, and only the band in between calls the LLM
+HIGH_CONFIDENCE = float(os.getenv("EVENT_RAG_HIGH_CONFIDENCE", "0.70"))
+LOW_CONFIDENCE = float(os.getenv("EVENT_RAG_LOW_CONFIDENCE", "0.25"))
+# In hybrid mode a query below LOW still reaches the LLM when its best BM25 match holds
+# this share of its term weight, or every number in it: dense similarity is weak on
+# exact tokens such as times, route numbers and phone numbers
+LEXICAL_COVERAGE = float(os.getenv("EVENT_RAG_LEXICAL_COVERAGE", "0.75"))
+EXTRACTIVE_MAX_LINES = 6
+EXTRACTIVE_STOPWORDS = {
+    "a", "an", "and", "are", "at", "can", "do", "does", "for", "how", "i", "in", "is",
+    "it", "me", "of", "on", "the", "there", "to", "what", "when", "where", "which", "who", "will",
+}
+
+# Token budget for the retrieved context in the QA prompt. Adjacent chunks are merged
+# and their overlap text removed before packing, best-ranked passages first.
+CONTEXT_TOKEN_BUDGET = int(os.getenv("EVENT_RAG_CONTEXT_TOKENS", "1200"))
+PROMPT_ENCODING = "cl100k_base"  # tokenizer of the default OpenAI completion model
+
+# Schedule blocks in the event documents, e.g.
+#   DAY 1 (Saturday, September 27, 2025):
+#   08:30 AM - 09:00 AM: Registration & Networking
+SCHEDULE_DAY_PATTERN = re.compile(r"\bDAY\s+(\d+)\s*\(([^)]*)\)", re.I)
+SCHEDULE_SLOT_PATTERN = re.compile(r"(\d{1,2}:\d{2}\s*[AP]M)\s*-\s*(\d{1,2}:\d{2}\s*[AP]M)\s*:\s*(.+)", re.I)
+
+# "What's next" is resolved against the venue's wall clock
+EVENT_TIMEZONE = os.getenv("EVENT_RAG_TIMEZONE", "Asia/Kolkata")
+
+# Number of most recent samples per stage kept for the latency percentiles
+LATENCY_WINDOW = 1000
+
+# Keyword lists used to route queries (plain substring match on the lowercased query)
+NAVIGATION_KEYWORDS = [
+    'how to reach', 'how to get', 'how to go', 'navigation', 'directions', 'route',
+    'from guindy', 'from airport', 'from central', 'from egmore', 'from t nagar',
+    'from omr', 'from velachery', 'from tambaram', 'from anna nagar',
+    'public transport', 'metro', 'bus', 'train', 'cab', 'taxi', 'auto',
+    'distance', 'travel time', 'way to', 'path to', 'driving', 'parking',
+    'nearest metro', 'nearest bus stop', 'transport', 'commute'
+]
+
+EXTERNAL_KEYWORDS = [
+    'current weather', 'today weather', 'weather forecast', 'temperature',
+    'latest news', 'current news', 'live updates', 'real time',
+    'hotels near', 'restaurants near', 'food near', 'accommodation',
+    'traffic update', 'road closure', 'current traffic'
+]
+
+def normalize_query(query: str) -> str:
+    """Lowercase words only, so "What is the schedule?" and "what is  the schedule" match"""
+    return " ".join(re.findall(r"\w+", query.lower()))
+
+@dataclass(frozen=True)
+class RouteDecision:
+    """Result of classifying a query once, passed down the response call chain.
+
+    It lives for exactly one request, so it also carries the request-scoped memo of
+    query vectors and search results.
+    """
+    is_navigation: bool
+    is_external: bool
+    search_memo: Dict[Any, Any] = field(default_factory=dict, compare=False, repr=False)
+    
+    def mark_live_search(self):
+        """The answer involved (or tried) live search, so it must not be precomputed"""
+        self.search_memo["live_search"] = True
+    
+    @property
+    def used_live_search(self) -> bool:
+        return self.search_memo.get("live_search", False)
+
+class LatencyTracker:
+    """Rolling per-stage latency samples (milliseconds) with percentile summaries"""
+    
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def span(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+    
+    def record(self, stage: str, elapsed_ms: float):
+        with self._lock:
+            self._samples.setdefault(stage, deque(maxlen=self.window)).append(elapsed_ms)
+    
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+    
+    @staticmethod
+    def _percentile(ordered: List[float], pct: float) -> float:
+        """Nearest-rank percentile of an already sorted list"""
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            snapshot = {stage: sorted(samples) for stage, samples in self._samples.items()}
+        return {
+            stage: {
+                "count": len(ordered),
+                "p50": round(self._percentile(ordered, 50), 2),
+                "p95": round(self._percentile(ordered, 95), 2),
+                "p99": round(self._percentile(ordered, 99), 2),
+            }
+            for stage, ordered in sorted(snapshot.items())
+            if ordered
+        }
+    
+    def to_json(self) -> str:
+        return json.dumps({"window": self.window, "stages_ms": self.summary()}, indent=2)
+
+class LRUCache:
+    """Small thread-safe LRU map shared by all sessions"""
+    
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key: Any, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+@lru_cache(maxsize=1)
+def _token_encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(PROMPT_ENCODING)
+    except Exception:  # not installed, or the encoding can't be downloaded
+        return None
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens for ``text``, estimated at ~4 characters per token without tiktoken"""
+    encoder = _token_encoder()
+    if encoder is None:
+        return (len(text) + 3) // 4
+    return len(encoder.encode(text))
+
+def _truncate_to_budget(text: str, budget: int) -> str:
+    """Leading whole lines of ``text`` that fit in ``budget`` tokens, then as many words
+    of the next line as fit, so a long single-line paragraph is cut rather than dropped"""
+    kept: List[str] = []
+    for line in text.splitlines():
+        if count_tokens("\n".join(kept + [line])) <= budget:
+            kept.append(line)
+            continue
+        # Longest word prefix of the line that still fits
+        words = line.split(" ")
+        low, high = 0, len(words)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if count_tokens("\n".join(kept + [" ".join(words[:middle])])) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        if low:
+            kept.append(" ".join(words[:low]))
+        break
+    truncated = "\n".join(kept)
+    if not truncated.strip() and budget > 0:
+        # Not even one word fits (e.g. a long URL): cut at token granularity
+        encoder = _token_encoder()
+        truncated = encoder.decode(encoder.encode(text.strip())[:budget]) if encoder else text.strip()[:budget * 4]
+    return truncated
+
+def pack_context(docs: List[Document], budget: int) -> Tuple[List[Document], int, int]:
+    """Assemble retrieved chunks into the fewest prompt tokens without losing content.
+
+    Overlapping or adjacent chunks of the same source are merged at their
+    ``start_index`` offsets, so the shared overlap text appears once. Passages
+    repeated inside a better-ranked passage are dropped, and the rest are
+    packed best-first into ``budget`` tokens (no limit when ``budget`` <= 0).
+    Returns the packed documents and the prompt tokens before and after.
+    """
+    raw_tokens = count_tokens("\n\n".join(doc.page_content for doc in docs))
+    
+    # Merge spans per source; a passage ranks as high as its best chunk
+    passages: List[Tuple[int, Document]] = []
+    spans: Dict[str, List[List[Any]]] = {}
+    for rank, doc in enumerate(docs):
+        start = doc.metadata.get("start_index")
+        if start is None:
+            passages.append((rank, doc))
+        else:
+            spans.setdefault(doc.metadata["source"], []).append([start, start + len(doc.page_content), rank, doc])
+    
+    for source_spans in spans.values():
+        source_spans.sort(key=lambda span: span[0])
+        merged = [source_spans[0][:]]
+        for start, end, rank, doc in source_spans[1:]:
+            current = merged[-1]
+            if start <= current[1]:
+                if end > current[1]:
+                    text = current[3].page_content + doc.page_content[current[1] - start:]
+                    current[3] = Document(page_content=text, metadata=current[3].metadata)
+                    current[1] = end
+                current[2] = min(current[2], rank)
+            else:
+                merged.append([start, end, rank, doc])
+        passages.extend((rank, doc) for _, _, rank, doc in merged)
+    passages.sort(key=lambda passage: passage[0])
+    
+    packed: List[Document] = []
+    used = 0
+    for _, doc in passages:
+        if any(doc.page_content in kept.page_content for kept in packed):
+            continue
+        # Separators count too: the "stuff" chain joins documents with a blank line
+        tokens = count_tokens(doc.page_content) + (1 if packed else 0)
+        if budget > 0 and used + tokens > budget:
+            if packed:
+                continue  # a later, shorter passage may still fit
+            text = _truncate_to_budget(doc.page_content, budget)
+            if not text:
+                continue
+            doc = Document(page_content=text, metadata=doc.metadata)
+            tokens = count_tokens(text)
+        packed.append(doc)
+        used += tokens
+    
+    packed_tokens = count_tokens("\n\n".join(doc.page_content for doc in packed))
+    return packed, raw_tokens, packed_tokens
+
+class EventRetriever(BaseRetriever):
+    """QA chain retriever that goes through the system's cached context retrieval"""
+    system: Any
+    
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> List[Document]:
+        return self.system.packed_context(query)[0]
+
+class BM25Index:
+    """In-memory inverted index with Okapi BM25 scoring over a fixed list of documents"""
+    
+    # Keep clock times ("12:45") together; everything else splits on word characters
+    TOKEN_PATTERN = re.compile(r"\d{1,2}:\d{2}|\w+")
+    
+    def __init__(self, documents: List[Document], k1: float = 1.5, b: float = 0.75):
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.doc_lengths: List[int] = []
+        
+        for doc_id, doc in enumerate(documents):
+            tokens = self.tokenize(doc.page_content)
+            self.doc_lengths.append(len(tokens))
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                self.postings.setdefault(token, []).append((doc_id, tf))
+        
+        self.avg_length = sum(self.doc_lengths) / len(self.doc_lengths) if documents else 0.0
+        n = len(documents)
+        self.idf = {
+            token: math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for token, posting in self.postings.items()
+        }
+    
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        return cls.TOKEN_PATTERN.findall(text.lower())
+    
+    def _scores(self, tokens: Iterable[str]) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for token in tokens:
+            idf = self.idf.get(token)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[token]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / self.avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+    
+    def search(self, query: str, k: int) -> List[Document]:
+        """Top-k documents sharing at least one term with the query"""
+        scores = self._scores(set(self.tokenize(query)))
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [self.documents[doc_id] for doc_id, _ in ranked]
+    
+    def best_match_coverage(self, query: str, ignore: Iterable[str] = ()) -> Tuple[float, bool]:
+        """How well the top BM25 match covers the query's terms (except ``ignore``).
+
+        Returns the share of the terms' IDF weight found in it (terms unknown to the
+        corpus weigh as much as the rarest known term) and whether it contains every
+        term with a digit, such as times, route numbers and phone numbers.
+        """
+        tokens = set(self.tokenize(query)) - set(ignore)
+        scores = self._scores(tokens)
+        if not scores:
+            return 0.0, False
+        best = max(scores, key=scores.get)
+        rarest = max(self.idf.values())
+        weights = {token: self.idf.get(token, rarest) for token in tokens}
+        matched = {token for token in tokens if any(doc_id == best for doc_id, _ in self.postings.get(token, ()))}
+        coverage = sum(weights[token] for token in matched) / sum(weights.values())
+        numbers = [token for token in tokens if any(char.isdigit() for char in token)]
+        return coverage, bool(numbers) and all(token in matched for token in numbers)
+
+def parse_schedule(text: str) -> List[Dict[str, Any]]:
+    """Extract "DAY n (Weekday, Month DD, YYYY):" blocks of "HH:MM AM - HH:MM PM: Title" lines"""
+    entries = []
+    day = label = None
+    for line in text.splitlines():
+        header = SCHEDULE_DAY_PATTERN.search(line)
+        if header:
+            day, label = int(header.group(1)), header.group(2).strip()
+            continue
+        slot = SCHEDULE_SLOT_PATTERN.search(line)
+        if slot and day is not None:
+            entries.append({
+                "day": day,
+                "label": label,
+                "start": _clock_to_minutes(slot.group(1)),
+                "end": _clock_to_minutes(slot.group(2)),
+                "title": slot.group(3).strip(),
+            })
+    return entries
+
+def _clock_to_minutes(clock: str) -> int:
+    parsed = datetime.strptime(re.sub(r"\s+", " ", clock.strip().upper()), "%I:%M %p")
+    return parsed.hour * 60 + parsed.minute
+
+def _minutes_to_clock(minutes: int) -> str:
+    return datetime(2000, 1, 1, minutes // 60, minutes % 60).strftime("%I:%M %p")
+
+class ScheduleIndex:
+    """Per-day interval index over the parsed schedule for instant time-based answers"""
+    
+    # "2 PM", "2:30pm", "14:30", "12:45" - but not "3 amenities" or "2 pmt passes"
+    TIME_PATTERN = re.compile(r"\b(\d{1,2})(?::(\d{2}))?\s*(a\.?m\.?|p\.?m\.?)(?![a-z])|\b(\d{1,2}):(\d{2})\b", re.I)
+    DAY_PATTERN = re.compile(r"\bday\s*(\d|one|two|three)\b|\b(first|second|third) day\b", re.I)
+    # "what's next" but not "what is next to the venue" / "next door"
+    NEXT_PATTERN = re.compile(
+        r"\bwhat(?:'s| is| comes) next\b(?!\s+(?:to|door)\b)|\bnext (session|talk|event|activity|item|slot)\b|"
+        r"\b(happening|going on|running) (now|right now)\b|\bcurrent session\b", re.I
+    )
+    # A clock time alone ("Is the food court open, 9 pm?") is not a schedule lookup
+    SLOT_PATTERN = re.compile(
+        r"\b(?:what(?:'s| is)?|anything|which (?:session|talk|event)s?)\s+"
+        r"(?:on|happening|happens|going on|running|scheduled|at)\b|"
+        r"\b(?:sessions?|talks?|schedule)\s+(?:at|for)\s+(?:\d|noon)", re.I
+    )
+    ORDINALS = {"one": 1, "two": 2, "three": 3, "first": 1, "second": 2, "third": 3}
+    
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.days: Dict[int, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            self.days.setdefault(entry["day"], []).append(entry)
+        for slots in self.days.values():
+            slots.sort(key=lambda entry: entry["start"])
+        self._starts = {day: [entry["start"] for entry in slots] for day, slots in self.days.items()}
+        
+        # Weekday names and calendar dates resolve to day numbers too
+        self.dates: Dict[int, datetime] = {}
+        self._day_names: Dict[str, int] = {}
+        for day, slots in self.days.items():
+            try:
+                date = datetime.strptime(slots[0]["label"], "%A, %B %d, %Y")
+            except (TypeError, ValueError):
+                continue
+            self.dates[day] = date
+            self._day_names[date.strftime("%A").lower()] = day
+    
+    def __bool__(self) -> bool:
+        return bool(self.days)
+    
+    def at(self, day: int, minute: int) -> Optional[Dict[str, Any]]:
+        """Session running on ``day`` at ``minute`` past midnight"""
+        slots = self.days.get(day, [])
+        i = bisect.bisect_right(self._starts.get(day, []), minute) - 1
+        if i >= 0 and minute < slots[i]["end"]:
+            return slots[i]
+        return None
+    
+    def next_after(self, day: int, minute: int) -> Optional[Dict[str, Any]]:
+        """First session starting after ``minute`` on ``day`` or on a later day"""
+        for candidate in sorted(d for d in self.days if d >= day):
+            if candidate > day:
+                return self.days[candidate][0]
+            i = bisect.bisect_right(self._starts[candidate], minute)
+            if i < len(self.days[candidate]):
+                return self.days[candidate][i]
+        return None
+    
+    def _query_days(self, query_lower: str) -> List[int]:
+        match = self.DAY_PATTERN.search(query_lower)
+        if match:
+            token = match.group(1) or match.group(2)
+            day = int(token) if token.isdigit() else self.ORDINALS[token]
+            return [day] if day in self.days else []
+        named = [day for name, day in self._day_names.items() if name in query_lower]
+        return named or sorted(self.days)
+    
+    def _query_minute(self, query: str) -> Optional[int]:
+        if "noon" in query.lower():
+            return 12 * 60
+        match = self.TIME_PATTERN.search(query)
+        if not match:
+            return None
+        if match.group(1):
+            hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)[0].lower()
+            hour = hour % 12 + (12 if meridiem == "p" else 0)
+        else:
+            hour, minute = int(match.group(4)), int(match.group(5))
+            if hour < 8:
+                hour += 12  # "2:00" during an event day means the afternoon
+        if hour > 23 or minute > 59:
+            return None
+        return hour * 60 + minute
+    
+    def _describe(self, entry: Dict[str, Any]) -> str:
+        return (f"**{entry['title']}** ({_minutes_to_clock(entry['start'])} - {_minutes_to_clock(entry['end'])}, "
+                f"Day {entry['day']}, {entry['label']})")
+    
+    def answer(self, query: str, now: Optional[datetime] = None) -> Optional[str]:
+        """Answer point-in-time and "what's next" questions, or None so retrieval handles the query"""
+        if not self.days:
+            return None
+        
+        if self.NEXT_PATTERN.search(query):
+            now = now or datetime.now(ZoneInfo(EVENT_TIMEZONE)).replace(tzinfo=None)
+            today = [day for day, date in self.dates.items() if date.date() == now.date()]
+            if today:
+                day, minute = today[0], now.hour * 60 + now.minute
+            elif self.dates and now.date() > max(self.dates.values()).date():
+                return "### 📅 Schedule\n\nThe event has ended - thanks for joining!"
+            else:
+                day, minute = min(self.days), -1
+            lines = ["### 📅 Schedule\n"]
+            current = self.at(day, minute)
+            if current:
+                lines.append(f"- **Now:** {self._describe(current)}")
+            upcoming = self.next_after(day, minute)
+            lines.append(f"- **Next:** {self._describe(upcoming)}" if upcoming else "- Nothing else is scheduled.")
+            return "\n".join(lines)
+        
+        if not self.SLOT_PATTERN.search(query):
+            return None
+        minute = self._query_minute(query)
+        if minute is None:
+            return None
+        lines = [f"### 📅 Schedule at {_minutes_to_clock(minute)}\n"]
+        for day in self._query_days(query.lower()):
+            entry = self.at(day, minute)
+            if entry:
+                lines.append(f"- {self._describe(entry)}")
+        # An empty slot may still be answered by the documents (opening hours, closing time, ...)
+        return "\n".join(lines) if len(lines) > 1 else None
+
+class QueryRouter:
+    """Single-pass intent classifier backed by precompiled alternation regexes"""
+    
+    def __init__(self, navigation_keywords: List[str] = NAVIGATION_KEYWORDS,
+                 external_keywords: List[str] = EXTERNAL_KEYWORDS):
+        self._navigation_pattern = self._compile(navigation_keywords)
+        self._external_pattern = self._compile(external_keywords)
+    
+    @staticmethod
+    def _compile(keywords: List[str]) -> "re.Pattern":
+        """Build one regex per intent from a character trie of the keywords.
+
+        Factoring shared prefixes ("from guindy|from airport" -> "from (?:guindy|airport)")
+        lets the regex engine reject most positions after one character instead of trying
+        every keyword. No word boundaries, so it matches exactly like `keyword in query`.
+        """
+        trie: Dict[str, dict] = {}
+        for keyword in set(keywords):
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}  # end of keyword
+        
+        def to_regex(node: Dict[str, dict]) -> str:
+            if "" in node:
+                # A shorter keyword ends here, so anything longer is redundant for search()
+                return ""
+            branches = [re.escape(char) + to_regex(child) for char, child in sorted(node.items())]
+            return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        
+        return re.compile(to_regex(trie))
+    
+    def route(self, query: str) -> RouteDecision:
+        query_lower = query.lower()
+        return RouteDecision(
+            is_navigation=self._navigation_pattern.search(query_lower) is not None,
+            is_external=self._external_pattern.search(query_lower) is not None
+        )
+
+class EnhancedEventRAGSystem:
+    def __init__(self, llm: Optional[BaseLanguageModel] = None, corpus_dir: Optional[str] = CORPUS_DIR,
+                 embeddings: Optional[Embeddings] = None, event_id: str = DEFAULT_EVENT_ID):
+        """Initialize the Enhanced Event RAG System with comprehensive navigation data.
+
+        ``llm`` overrides the OpenAI completion model (e.g. a fake LLM for offline runs).
+        ``corpus_dir`` loads documents from a directory instead of the built-in data.
+        ``embeddings`` reuses an already loaded model, e.g. one shared by many events.
+        """
+        self.event_id = event_id
+        self.llm = llm
+        self.corpus_dir = corpus_dir
+        self.embeddings = embeddings
+        self.vectorstore = None
+        self.partitions: Dict[str, FAISS] = {}  # one index per metadata type
+        self.sparse_index: Optional[BM25Index] = None
+        self._manifest: Dict[str, dict] = {}  # corpus unit id -> hash, signature, chunk ids, schedule
+        self.corpus_errors: Dict[str, str] = {}  # corpus units skipped by the last sync -> reason
+        self.schedule_index = ScheduleIndex([])
+        self.retrieval_mode = RETRIEVAL_MODE
+        self.qa_chain = None
+        self.search = None
+        self.router = QueryRouter()
+        self.concurrent_search = CONCURRENT_SEARCH
+        self.search_deadline = SEARCH_DEADLINE_SECONDS
+        
+        # Confidence gate decisions: LLM calls are only made in the "middle" band
+        self.gate_decisions: Dict[str, int] = {}
+        self._gate_lock = threading.Lock()
+        
+        # (raw, packed) context tokens of recent LLM prompts
+        self.context_budget = CONTEXT_TOKEN_BUDGET
+        self.context_tokens: deque = deque(maxlen=LATENCY_WINDOW)
+        
+        # Per-stage timing spans (intent, embedding, faiss_search, bm25_search, llm, serpapi, total)
+        self.metrics = LatencyTracker()
+        
+        # Serializes corpus updates; searches are lock-free on swapped-in index copies
+        self._lock = threading.RLock()
+        
+        # Query vectors depend only on the embedding model; results also on the index
+        self._vector_cache = LRUCache()
+        self._result_cache = LRUCache()
+        
+        # Precomputed quick-action answers: {"key": corpus + config hash, "answers": {normalized query: (text, type)}}
+        self._quick_answers: Dict[str, Any] = {}
+        self._warm_future = None
+        self._corpus_hash = ""
+        
+        # Initialize components with error handling
+        if self.embeddings is None:
+            self._initialize_embeddings()
+        self._initialize_search()
+        self._initialize_with_event_data()
+    
+    def _initialize_embeddings(self):
+        """Initialize embeddings with fallback options"""
+        try:
+            if EMBEDDING_BACKEND in ("onnx", "onnx-int8"):
+                # Optional dependency: onnxruntime + tokenizers instead of torch
+                from onnx_embeddings import ONNXMiniLMEmbeddings
+                self.embeddings = ONNXMiniLMEmbeddings(quantized=EMBEDDING_BACKEND == "onnx-int8")
+            else:
+                self.embeddings = HuggingFaceEmbeddings(
+                    model_name=EMBEDDING_MODEL_NAME,
+                    model_kwargs={'device': 'cpu'}
+                )
+            logger.info(f"✅ Embeddings initialized successfully ({EMBEDDING_BACKEND})")
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize embeddings: {e}")
+    
+    def _initialize_search(self):
+        """Initialize search with proper error handling"""
+        serpapi_key = os.getenv("SERPAPI_API_KEY")
+        if serpapi_key:
+            try:
+                # One cache and circuit breaker per process, shared by every event
+                global _live_search
+                with _live_search_lock:
+                    if _live_search is None:
+                        _live_search = ResilientSearch(
+                            SerpAPIWrapper(serpapi_api_key=serpapi_key),
+                            ttl=SEARCH_CACHE_TTL, timeout=SEARCH_TIMEOUT_SECONDS, db_path=SEARCH_CACHE_DB
+                        )
+                self.search = _live_search
+                logger.info("✅ Search API initialized successfully")
+            except Exception as e:
+                logger.warning(f"⚠️ Search API initialization failed: {e}")
+        else:
+            logger.info("ℹ️ SERP API key not provided - Using built-in navigation data")
+    
+    def _get_navigation_data(self) -> Dict[str, str]:
+        """Comprehensive navigation information for Chennai locations"""
+        return {
+            "guindy_to_venue": """
+            🧭 DIRECTIONS FROM GUINDY TO IIT MADRAS RESEARCH PARK
+
+            📍 **Route Overview:** Guindy → Velachery → Tharamani → IIT Research Park
+            📏 **Distance:** Approximately 8-10 km
+            ⏱️ **Travel Time:** 25-40 minutes (depending on traffic and mode)
+
+            🚗 **BY CAR/TAXI/AUTO:**
+            1. Start from Guindy Railway Station area
+            2. Head towards Guindy-Velachery Road
+            3. Take the road towards Velachery (via Guindy-Velachery Main Road)
+            4. Continue straight until you reach Velachery
+            5. From Velachery, head towards Tharamani via Velachery-Tambaram Road
+            6. Take right turn towards Tharamani Main Road
+            7. Continue on Tharamani Main Road
+            8. Look for IIT Madras Research Park signboard on your right
+            9. Enter the campus and follow signs to E-Block/Ramanujan Hall
+
+            🚌 **BY BUS:**
+            - Take buses going to Tharamani from Guindy
+            - Route numbers: 5G, 18G, 21G, 570
+            - Get down at Tharamani Bus Stand
+            - Take auto/walk (1 km) to IIT Research Park
+            - Alternative: Take bus to Velachery, then change to Tharamani bus
+
+            🚇 **BY METRO + BUS/AUTO:**
+            1. Take Metro from Guindy to Velachery Station (Blue Line)
+            2. From Velachery Metro, take bus/auto to Tharamani
+            3. Buses from Velachery to Tharamani: 5G, 21G, 570
+            4. Auto fare: ₹60-80 from Velachery to venue
+
+            💰 **ESTIMATED COSTS:**
+            - Auto from Guindy: ₹120-150
+            - Taxi/Ola/Uber: ₹150-250
+            - Bus: ₹15-25 per person
+            - Metro + Bus: ₹25-35 per person
+
+            🕐 **BEST TRAVEL TIMES:**
+            - Morning (8:00-8:30 AM): Moderate traffic
+            - Avoid 9:00-10:00 AM: Heavy traffic
+            - Return evening: Leave by 4:00 PM to avoid peak traffic
+            """,
+            
+            "general_navigation": """
+            🗺️ **GENERAL NAVIGATION TO IIT MADRAS RESEARCH PARK**
+
+            📍 **Venue Address:**
+            Ramanujan Hall (E Block - Ground Floor)
+            IIT Madras Research Park
+            Tharamani, Chennai - 600113
+
+            🚗 **FROM DIFFERENT LOCATIONS:**
+
+            **From Airport (Chennai Airport):**
+            - Distance: 12-15 km
+            - Time: 30-45 minutes
+            - Route: Airport → GST Road → Guindy → Velachery → Tharamani
+            - Taxi fare: ₹300-400
+
+            **From Central Railway Station:**
+            - Take suburban train to Guindy (₹10)
+            - Then follow Guindy to venue directions
+            - Total time: 45-60 minutes
+
+            **From Egmore:**
+            - Metro to Guindy → then bus/auto to venue
+            - Or direct bus to Tharamani (route 27B, 570)
+            - Time: 45-60 minutes
+
+            **From T. Nagar:**
+            - Bus to Guindy/Velachery, then to Tharamani
+            - Auto: ₹150-200 directly
+            - Time: 30-45 minutes
+
+            **From OMR (IT Corridor):**
+            - Very convenient - Tharamani is on OMR
+            - From Sholinganallur: 15 minutes
+            - From Perungudi: 10 minutes
+            - From Thoraipakkam: 20 minutes
+
+            🅿️ **PARKING AT VENUE:**
+            - Free parking available inside research park
+            - Separate areas for 2-wheelers and 4-wheelers
+            - Security check at entry gate
+            - Carry ID proof for entry
+
+            📱 **NAVIGATION APPS:**
+            - Google Maps: Search "IIT Madras Research Park"
+            - Use landmark: "Tharamani Main Road"
+            - GPS Coordinates: 12.9916° N, 80.2336° E
+            """,
+            
+            "public_transport": """
+            🚌 **DETAILED PUBLIC TRANSPORT OPTIONS**
+
+            **BUS ROUTES TO THARAMANI:**
+            - Route 5G: Guindy → Velachery → Tharamani
+            - Route 18G: T.Nagar → Guindy → Tharamani
+            - Route 21G: Broadway → Guindy → Tharamani  
+            - Route 570: Koyambedu → Guindy → Tharamani
+            - Route 27B: Egmore → Tharamani (direct)
+
+            **METRO CONNECTIONS:**
+            - Blue Line: Take metro to Velachery station
+            - From Velachery: Bus/Auto to Tharamani (3 km)
+            - Green Line: Take metro to Guindy, then bus to Tharamani
+
+            **SUBURBAN TRAINS:**
+            - Get down at Guindy Railway Station
+            - Multiple trains from Central/Egmore to Guindy
+            - From Guindy station: 8 km to venue via bus/auto
+
+            **AUTO/TAXI BOOKING:**
+            - Ola/Uber readily available
+            - Share auto stands at Guindy, Velachery
+            - Pre-book for morning arrival to avoid delays
+
+            ⏰ **TIMING RECOMMENDATIONS:**
+            - Start journey by 8:00 AM for 9:00 AM event
+            - Account for traffic and registration time
+            - Public transport may take longer during peak hours
+            """
+        }
+    
+    def _get_event_data(self) -> Dict[str, str]:
+        """Enhanced event data with comprehensive information"""
+        return {
+            "event_guidelines": """
+            GenAI Architect - Offline Class Event Guidelines & Schedule
+            
+            📅 EVENT DATES & TIMING
+            Day 1: Saturday, September 27, 2025 - 09:00 AM to 04:30 PM
+            Day 2: Sunday, September 28, 2025 - 09:00 AM to 04:00 PM
+            
+            📍 VENUE INFORMATION
+            Location: Ramanujan Hall (E Block - Ground Floor)
+            Address: IIT Madras Research Park, Tharamani, Chennai - 600113
+            
+            ⏰ DETAILED SCHEDULE
+            
+            DAY 1 (Saturday, September 27, 2025):
+            08:30 AM - 09:00 AM: Registration & Networking
+            09:00 AM - 12:30 PM: General Revision and Doubt Clearing
+            12:30 PM - 12:45 PM: Hackathon Introduction and Team Formation
+            12:45 PM - 02:00 PM: Lunch Break with Team Networking
+            02:00 PM - 04:30 PM: Design and Development Process
+            
+            DAY 2 (Sunday, September 28, 2025):
+            09:00 AM - 11:30 AM: Design and Development Process (Continuation)
+            11:30 AM - 12:45 PM: Project Review and Feedback
+            12:45 PM - 02:00 PM: Lunch Break with Team Networking
+            02:00 PM - 04:00 PM: Final Review and Closing Ceremony
+            
+            📱 SOCIAL MEDIA GUIDELINES
+            - Tag: @socialeagle.ai, @dharaneetharan
+            - Hashtags: #flyhighwithai #socialeagle
+            - Share your learning moments and networking experiences
+            
+            📋 IMPORTANT REMINDERS
+            - Event starts SHARP at 09:00 AM (Registration from 08:30 AM)
+            - Laptop is MANDATORY for all participants
+            - Mobile phones on silent mode during sessions
+            - Early arrivals get networking opportunities with community members
+            - This is a non-judgmental space for growth and learning
+            
+            🎯 SPECIAL FEATURES
+            - Spark Moment Action: Cheer and clap when you have breakthrough moments
+            - Collaborative hackathon with team formation
+            - Networking opportunities during breaks
+            - Community WhatsApp updates
+            
+            🚨 SAFETY & SUPPORT
+            - Notify crew if feeling unwell
+            - Emergency contact: 842 842 6700
+            - Stay hydrated and take breaks as needed
+            """,
+            
+            "venue_amenities": """
+            🏢 VENUE FACILITIES & AMENITIES
+            
+            **Ramanujan Hall Features:**
+            - Air-conditioned conference hall
+            - Audio-visual equipment and projectors
+            - High-speed WiFi connectivity
+            - Comfortable seating arrangement
+            - Power outlets for laptops
+            - Whiteboards and presentation screens
+            
+            **IIT Research Park Amenities:**
+            - Clean restroom facilities
+            - Drinking water stations
+            - Food court and cafeteria options
+            - ATM and basic shopping
+            - Security and visitor management
+            - Accessible parking areas
+            
+            **Nearby Facilities:**
+            - Restaurants and food outlets within 500m
+            - Medical facilities nearby
+            - Public transport connectivity
+            - Fuel stations and ATMs
+            """
+        }
+    
+    def _built_in_units(self) -> Dict[str, Tuple[Optional[List[int]], Callable[[], List[Document]]]]:
+        """The hardcoded event and navigation data, one corpus unit per entry"""
+        units = {}
+        for prefix, doc_type, data in (
+            ("event", "event_info", self._get_event_data()),
+            ("navigation", "navigation", self._get_navigation_data()),
+        ):
+            for key, content in data.items():
+                source = f"{prefix}_{key}"
+                document = Document(page_content=content, metadata={"source": source, "type": doc_type})
+                units[source] = (None, lambda document=document: [document])
+        return units
+    
+    def _directory_units(self) -> Dict[str, Tuple[Optional[List[int]], Callable[[], List[Document]]]]:
+        """One corpus unit per markdown/text/JSON file under ``corpus_dir``.
+
+        Files under a top-level ``navigation/`` folder are navigation documents, everything
+        else is event information. A JSON file holds ``{"type": ..., "documents": {key: text}}``.
+        """
+        units = {}
+        for root, _, files in os.walk(self.corpus_dir):
+            for name in sorted(files):
+                if not name.lower().endswith(CORPUS_EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                rel_path = os.path.relpath(path, self.corpus_dir).replace(os.sep, "/")
+                stat = os.stat(path)
+                units[rel_path] = (
+                    [stat.st_mtime_ns, stat.st_size],
+                    lambda path=path, rel_path=rel_path: self._read_corpus_file(path, rel_path)
+                )
+        return units
+    
+    def _read_corpus_file(self, path: str, rel_path: str) -> List[Document]:
+        default_type = "navigation" if rel_path.split("/")[0] == "navigation" else "event_info"
+        with open(path, encoding="utf-8") as f:
+            if not path.lower().endswith(".json"):
+                return [Document(page_content=f.read(), metadata={"source": rel_path, "type": default_type})]
+            data = json.load(f)
+        if not isinstance(data, dict) or not isinstance(data.get("documents"), dict):
+            raise ValueError('expected {"type": ..., "documents": {key: text}}')
+        if not all(isinstance(content, str) for content in data["documents"].values()):
+            raise ValueError("every document must be a string")
+        doc_type = data.get("type", default_type)
+        if not isinstance(doc_type, str) or not DOC_TYPE_PATTERN.fullmatch(doc_type) or doc_type == ALL_DOCUMENTS:
+            raise ValueError(f"type must match {DOC_TYPE_PATTERN.pattern} and not be {ALL_DOCUMENTS!r}, got {doc_type!r}")
+        return [
+            Document(page_content=content, metadata={"source": f"{rel_path}#{key}", "type": doc_type})
+            for key, content in data["documents"].items()
+        ]
+    
+    def _cache_path(self) -> str:
+        """Cache entry for this corpus location and every setting that affects the vectors"""
+        payload = json.dumps({
+            "corpus": os.path.abspath(self.corpus_dir) if self.corpus_dir else "built-in",
+            "chunk_size": CHUNK_SIZE,
+            "chunk_overlap": CHUNK_OVERLAP,
+            "embedding_model": EMBEDDING_MODEL_NAME,
+            "embedding_backend": EMBEDDING_BACKEND,
+            "index_layout": "partitioned-v3",
+        }, sort_keys=True)
+        return os.path.join(INDEX_CACHE_DIR, hashlib.sha256(payload.encode("utf-8")).hexdigest())
+    
+    def _load_cached_indexes(self, cache_path: str) -> Tuple[Dict[str, FAISS], Dict[str, dict]]:
+        """Load the persisted indexes and their manifest, or nothing if unusable"""
+        manifest_path = os.path.join(cache_path, MANIFEST_FILE)
+        if not os.path.isfile(manifest_path):
+            return {}, {}
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            # The cache is written by this app only, so unpickling the docstore is safe
+            indexes = {
+                name: FAISS.load_local(
+                    os.path.join(cache_path, name), self.embeddings,
+                    allow_dangerous_deserialization=True
+                )
+                for name in os.listdir(cache_path)
+                if name != MANIFEST_FILE
+            }
+            if manifest and ALL_DOCUMENTS not in indexes:
+                return {}, {}
+            logger.info(f"✅ Loaded cached vector indexes ({len(manifest)} documents)")
+            return indexes, manifest
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable index cache {cache_path}: {e}")
+            return {}, {}
+    
+    def _save_indexes(self, cache_path: str, indexes: Dict[str, FAISS], manifest: Dict[str, dict]):
+        """Persist the indexes and manifest, swapping the cache entry in atomically"""
+        try:
+            os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+            tmp_path = tempfile.mkdtemp(prefix=".tmp-", dir=INDEX_CACHE_DIR)
+            for name, index in indexes.items():
+                index.save_local(os.path.join(tmp_path, name))
+            with open(os.path.join(tmp_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            
+            # A directory cannot be renamed over a non-empty one, so move the old entry aside
+            old_path = None
+            if os.path.exists(cache_path):
+                old_path = tempfile.mkdtemp(prefix=".old-", dir=INDEX_CACHE_DIR)
+                os.replace(cache_path, os.path.join(old_path, "entry"))
+            os.replace(tmp_path, cache_path)
+            if old_path:
+                shutil.rmtree(old_path, ignore_errors=True)
+            logger.info(f"💾 Saved vector indexes ({len(manifest)} documents)")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not persist vector indexes: {e}")
+    
+    def _copy_index(self, index: FAISS) -> FAISS:
+        """Independent copy, so readers keep searching the old index during an update"""
+        return FAISS.deserialize_from_bytes(
+            index.serialize_to_bytes(), self.embeddings, allow_dangerous_deserialization=True
+        )
+    
+    def _apply_changes(self, indexes: Dict[str, FAISS], stale_ids: List[str],
+                       chunks: List[Document], chunk_ids: List[str]) -> Dict[str, FAISS]:
+        """Return updated copies of the indexes with stale chunks removed and new ones added.
+
+        Only the new chunks are embedded, once, and shared by the combined index and
+        their type's partition.
+        """
+        updated = {name: self._copy_index(index) for name, index in indexes.items()}
+        
+        stale = set(stale_ids)
+        for index in updated.values():
+            present = [doc_id for doc_id in index.index_to_docstore_id.values() if doc_id in stale]
+            if present:
+                index.delete(present)
+        
+        if chunks:
+            vectors = self.embeddings.embed_documents([chunk.page_content for chunk in chunks])
+            by_index: Dict[str, List[int]] = {ALL_DOCUMENTS: list(range(len(chunks)))}
+            for i, chunk in enumerate(chunks):
+                by_index.setdefault(chunk.metadata["type"], []).append(i)
+            
+            for name, members in by_index.items():
+                text_embeddings = [(chunks[i].page_content, vectors[i]) for i in members]
+                metadatas = [chunks[i].metadata for i in members]
+                ids = [chunk_ids[i] for i in members]
+                if name in updated:
+                    updated[name].add_embeddings(text_embeddings, metadatas=metadatas, ids=ids)
+                else:
+                    updated[name] = FAISS.from_embeddings(text_embeddings, self.embeddings, metadatas=metadatas, ids=ids)
+        return updated
+    
+    def sync_corpus(self) -> Dict[str, int]:
+        """Bring the indexes in line with the corpus, re-embedding only changed documents.
+
+        Each corpus unit (a built-in entry or a file) is tracked in a manifest by content
+        hash and, for files, mtime/size; unchanged files are not even read. Chunks of
+        removed or changed units are deleted by id and the new chunks are added.
+        """
+        with self._lock:
+            manifest = {unit_id: dict(entry) for unit_id, entry in self._manifest.items()}
+            units = self._directory_units() if self.corpus_dir else self._built_in_units()
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=CHUNK_SIZE,
+                chunk_overlap=CHUNK_OVERLAP,
+                add_start_index=True  # lets context packing merge overlapping chunks
+            )
+            
+            removed = [unit_id for unit_id in manifest if unit_id not in units]
+            new_chunks: List[Document] = []
+            new_chunk_ids: List[str] = []
+            new_entries: Dict[str, dict] = {}
+            errors: Dict[str, str] = {}
+            touched = 0
+            
+            for unit_id, (signature, load) in units.items():
+                entry = manifest.get(unit_id)
+                if (entry and signature is not None and entry.get("signature") == signature
+                        and "schedule" in entry):
+                    continue
+                try:
+                    documents = load()
+                except (OSError, ValueError) as e:
+                    # One malformed file must not break the whole event; any chunks it
+                    # had from an earlier good version stay indexed
+                    logger.warning(f"⚠️ Skipping corpus file {unit_id}: {e}")
+                    errors[unit_id] = str(e)
+                    continue
+                content_hash = hashlib.sha256(json.dumps(
+                    [[doc.page_content, doc.metadata] for doc in documents], sort_keys=True
+                ).encode("utf-8")).hexdigest()
+                schedule = [slot for doc in documents for slot in parse_schedule(doc.page_content)]
+                if entry and entry["hash"] == content_hash:
+                    if entry.get("signature") != signature or entry.get("schedule") != schedule:
+                        # Touched but unchanged, or cached before schedules were tracked
+                        entry.update(signature=signature, schedule=schedule)
+                        touched += 1
+                    continue
+                if entry:
+                    removed.append(unit_id)
+                
+                chunks = text_splitter.split_documents(documents)
+                chunk_ids = [f"{unit_id}::{i}" for i in range(len(chunks))]
+                new_chunks.extend(chunks)
+                new_chunk_ids.extend(chunk_ids)
+                new_entries[unit_id] = {
+                    "hash": content_hash, "signature": signature,
+                    "chunk_ids": chunk_ids, "schedule": schedule,
+                }
+            
+            changed = sum(1 for unit_id in new_entries if unit_id in manifest)
+            stats = {
+                "added": len(new_entries) - changed,
+                "changed": changed,
+                "removed": len(removed) - changed,
+                "chunks_embedded": len(new_chunks),
+                "skipped": len(errors),
+            }
+            self.corpus_errors = errors
+            if not removed and not new_entries:
+                if touched:
+                    self._set_manifest(manifest)
+                    self._save_indexes(self._cache_path(), self._indexes(), manifest)
+                return stats
+            
+            stale_ids = [chunk_id for unit_id in removed for chunk_id in manifest.pop(unit_id)["chunk_ids"]]
+            manifest.update(new_entries)
+            indexes = self._apply_changes(self._indexes(), stale_ids, new_chunks, new_chunk_ids)
+            self._install_indexes(indexes, manifest)
+            self._save_indexes(self._cache_path(), indexes, manifest)
+            logger.info(f"🔄 Corpus synced: {stats}")
+            
+            # Answers precomputed for the old corpus no longer match, so redo them
+            if self._warm_future is not None:
+                self.warm_quick_actions()
+            return stats
+    
+    def _indexes(self) -> Dict[str, FAISS]:
+        indexes = dict(self.partitions)
+        if self.vectorstore is not None:
+            indexes[ALL_DOCUMENTS] = self.vectorstore
+        return indexes
+    
+    def _install_indexes(self, indexes: Dict[str, FAISS], manifest: Dict[str, dict]):
+        """Swap in a new set of indexes; in-flight searches finish on the old objects"""
+        indexes = dict(indexes)
+        vectorstore = indexes.pop(ALL_DOCUMENTS, None)
+        self.sparse_index = BM25Index(self._indexed_documents(vectorstore)) if vectorstore else None
+        self.partitions = indexes
+        self.vectorstore = vectorstore
+        self._set_manifest(manifest)
+        self._result_cache.clear()
+    
+    def memory_bytes(self) -> int:
+        """Approximate RAM held by this event's indexes: float32 vectors plus chunk text"""
+        total = 0
+        for index in self._indexes().values():
+            total += index.index.ntotal * index.index.d * 4
+            total += sum(len(doc.page_content) for doc in self._indexed_documents(index))
+        return total
+    
+    def _set_manifest(self, manifest: Dict[str, dict]):
+        """Adopt a manifest and rebuild the schedule index from its parsed time slots"""
+        self._manifest = manifest
+        self._corpus_hash = hashlib.sha256(json.dumps(
+            {unit_id: entry["hash"] for unit_id, entry in manifest.items()}, sort_keys=True
+        ).encode("utf-8")).hexdigest()
+        self.schedule_index = ScheduleIndex(
+            [slot for entry in manifest.values() for slot in entry.get("schedule", [])]
+        )
+    
+    def _initialize_with_event_data(self):
+        """Initialize the system with comprehensive event and navigation data"""
+        if not self.embeddings:
+            logger.error("❌ Cannot initialize without embeddings")
+            return
+            
+        try:
+            # Start from the persisted indexes and only embed what changed since
+            indexes, manifest = self._load_cached_indexes(self._cache_path())
+            self._install_indexes(indexes, manifest)
+            self.sync_corpus()
+            
+            # Create QA chain if OpenAI API key is available
+            openai_key = os.getenv("OPENAI_API_KEY")
+            if self.llm is None and openai_key:
+                self.llm = OpenAI(openai_api_key=openai_key, temperature=0.1)
+            if self.llm is not None:
+                self.qa_chain = RetrievalQA.from_chain_type(
+                    llm=self.llm,
+                    chain_type="stuff",
+                    retriever=EventRetriever(system=self),
+                    chain_type_kwargs={"prompt": QA_PROMPT},
+                    return_source_documents=True
+                )
+                logger.info("✅ QA chain initialized with OpenAI")
+            else:
+                logger.info("ℹ️ Using similarity search without OpenAI")
+            
+            # The quick actions ask about the default event's venue and travel, so
+            # other events would only pay for irrelevant answers
+            if WARM_QUICK_ACTIONS and self.event_id == DEFAULT_EVENT_ID:
+                self.warm_quick_actions()
+                
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize event data: {e}")
+    
+    def _answers_key(self) -> str:
+        """Hash of everything a precomputed answer depends on: corpus, models and answer settings"""
+        payload = json.dumps({
+            "corpus": self._corpus_hash,
+            "index": self._cache_path(),  # embedding model and chunking
+            "llm": getattr(self.llm, "_identifying_params", None) if self.qa_chain else None,
+            "retrieval_mode": self.retrieval_mode,
+            "context_budget": self.context_budget,
+            "live_search": self.search is not None,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _answers_path(self) -> str:
+        return self._cache_path() + ".answers.json"
+    
+    def quick_answer(self, query: str) -> Optional[Tuple[str, str]]:
+        """Precomputed answer for a query normalizing to a quick action, if still current"""
+        warm = self._quick_answers
+        if not warm or warm["key"] != self._answers_key():
+            return None
+        answer = warm["answers"].get(normalize_query(query))
+        return tuple(answer) if answer else None
+    
+    def warm_quick_actions(self):
+        """Compute the quick-action answers in the background (or load them from disk)"""
+        self._warm_future = _warm_executor.submit(self._warm_quick_actions)
+    
+    def wait_for_quick_actions(self, timeout: Optional[float] = None):
+        if self._warm_future is not None:
+            self._warm_future.result(timeout)
+    
+    def _warm_quick_actions(self):
+        key = self._answers_key()
+        path = self._answers_path()
+        try:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    stored = json.load(f)
+                if stored.get("key") == key:
+                    self._quick_answers = stored
+                    logger.info(f"⚡ Loaded {len(stored['answers'])} precomputed quick-action answers")
+                    return
+            except (OSError, ValueError):
+                pass
+            
+            answers = {}
+            for _, _, query in QUICK_ACTIONS:
+                route = self.router.route(query)
+                response, response_type = self._get_response(query, route)
+                # Live results (and "not available" notes) expire with the search TTL, so
+                # those quick actions are answered at request time instead
+                if response_type not in ("error", "warning") and not route.used_live_search:
+                    answers[normalize_query(query)] = [response, response_type]
+            warm = {"key": key, "answers": answers}
+            self._quick_answers = warm
+            
+            os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(warm, f)
+            os.replace(tmp_path, path)
+            logger.info(f"⚡ Precomputed {len(answers)} quick-action answers")
+        except Exception as e:
+            logger.warning(f"⚠️ Quick-action warm-up failed: {e}")
+    
+    def is_navigation_query(self, query: str) -> bool:
+        """Enhanced navigation query detection"""
+        return self.router.route(query).is_navigation
+    
+    def is_external_query(self, query: str) -> bool:
+        """Check if query requires external search"""
+        return self.router.route(query).is_external
+    
+    def embed_query(self, query: str, route: Optional[RouteDecision] = None) -> List[float]:
+        """Embed a query at most once per request, reusing vectors across requests"""
+        memo = route.search_memo if route else {}
+        memo_key = ("vector", query)
+        if memo_key in memo:
+            return memo[memo_key]
+        
+        vector = self._vector_cache.get(query)
+        if vector is None:
+            with self.metrics.span("embedding"):
+                vector = self.embeddings.embed_query(query)
+            self._vector_cache.put(query, vector)
+        memo[memo_key] = vector
+        return vector
+    
+    def cached_similarity_search(self, query: str, k: int = 4, route: Optional[RouteDecision] = None,
+                                 doc_type: Optional[str] = None, with_scores: bool = False) -> List[Any]:
+        """Similarity search memoized per request and in a bounded cross-request LRU.
+
+        With ``doc_type`` the search runs only over that type's partition, so it
+        returns up to k documents of the requested type. With ``with_scores`` it
+        returns (document, L2 distance) pairs.
+        """
+        memo = route.search_memo if route else {}
+        cache_key = (query, k, doc_type)
+        scored = memo.get(("search",) + cache_key)
+        
+        if scored is None:
+            scored = self._result_cache.get(cache_key)
+            if scored is None:
+                index = self.partitions.get(doc_type) if doc_type else self.vectorstore
+                if index is None:
+                    scored = []
+                else:
+                    vector = self.embed_query(query, route)
+                    with self.metrics.span("faiss_search"):
+                        scored = index.similarity_search_with_score_by_vector(vector, k=k)
+                self._result_cache.put(cache_key, scored)
+            memo[("search",) + cache_key] = scored
+        
+        return scored if with_scores else [doc for doc, _ in scored]
+    
+    @staticmethod
+    def _indexed_documents(vectorstore: FAISS) -> List[Document]:
+        """Documents in FAISS row order, so the sparse index sees exactly the same chunks"""
+        return [
+            vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+            for i in range(vectorstore.index.ntotal)
+        ]
+    
+    def hybrid_search(self, query: str, k: int = 4, route: Optional[RouteDecision] = None) -> List[Document]:
+        """Fuse BM25 and dense rankings with reciprocal rank fusion"""
+        cache_key = ("hybrid", query, k)
+        docs = self._result_cache.get(cache_key)
+        if docs is not None:
+            return docs
+        
+        dense = self.cached_similarity_search(query, k=HYBRID_CANDIDATES, route=route)
+        sparse = []
+        if self.sparse_index:
+            with self.metrics.span("bm25_search"):
+                sparse = self.sparse_index.search(query, HYBRID_CANDIDATES)
+        
+        scores: Dict[int, float] = {}
+        by_id: Dict[int, Document] = {}
+        for ranking in (dense, sparse):
+            for rank, doc in enumerate(ranking):
+                # Both rankings hold the docstore's own Document objects
+                scores[id(doc)] = scores.get(id(doc), 0.0) + 1.0 / (RRF_K + rank + 1)
+                by_id[id(doc)] = doc
+        
+        docs = [by_id[doc_id] for doc_id in sorted(scores, key=scores.get, reverse=True)[:k]]
+        self._result_cache.put(cache_key, docs)
+        return docs
+    
+    def retrieve_context(self, query: str, route: Optional[RouteDecision] = None) -> List[Document]:
+        """Chunks handed to the LLM, using the configured retrieval mode"""
+        k = QA_TOP_K[self.retrieval_mode]
+        if self.retrieval_mode == "hybrid":
+            return self.hybrid_search(query, k=k, route=route)
+        return self.cached_similarity_search(query, k=k, route=route)
+    
+    def packed_context(self, query: str, route: Optional[RouteDecision] = None) -> Tuple[List[Document], int, int]:
+        """Retrieved chunks merged, de-duplicated and packed into the context token budget"""
+        cache_key = ("packed", query, self.context_budget)
+        packed = self._result_cache.get(cache_key)
+        if packed is None:
+            docs = self.retrieve_context(query, route)
+            with self.metrics.span("context_packing"):
+                packed = pack_context(docs, self.context_budget)
+            self._result_cache.put(cache_key, packed)
+        return packed
+    
+    def _record_context(self, raw_tokens: int, packed_tokens: int):
+        self.context_tokens.append((raw_tokens, packed_tokens))
+        logger.info(f"📦 Context packed: {raw_tokens} → {packed_tokens} tokens "
+                    f"({raw_tokens - packed_tokens} saved)")
+    
+    def context_savings(self) -> Dict[str, float]:
+        """Prompt tokens saved by context packing over the recent LLM queries"""
+        samples = list(self.context_tokens)
+        if not samples:
+            return {}
+        raw = sum(raw_tokens for raw_tokens, _ in samples)
+        packed = sum(packed_tokens for _, packed_tokens in samples)
+        return {
+            "queries": len(samples),
+            "raw_tokens": raw,
+            "packed_tokens": packed,
+            "saved_per_query": round((raw - packed) / len(samples), 1),
+        }
+    
+    def get_built_in_navigation_response(self, query: str, route: Optional[RouteDecision] = None) -> Tuple[str, str]:
+        """Get navigation response from built-in data"""
+        try:
+            # Use similarity search to find relevant navigation info
+            if self.vectorstore:
+                # Search only the navigation partition
+                nav_docs = self.cached_similarity_search(query, k=2, route=route, doc_type="navigation")
+                
+                if nav_docs:
+                    response = "### 🧭 Navigation Directions\n\n"
+                    
+                    # Combine relevant navigation information
+                    for doc in nav_docs:  # Top 2 most relevant
+                        response += f"{doc.page_content}\n\n"
+                    
+                    response += "---\n💡 **Additional Tips:**\n"
+                    response += "- Use Google Maps for real-time navigation\n"
+                    response += "- Account for Chennai traffic during morning hours\n" 
+                    response += "- Keep emergency contact handy: 842 842 6700\n"
+                    response += "- Carry ID proof for research park entry"
+                    
+                    return response, "navigation"
+                else:
+                    # Fallback to general navigation if specific route not found
+                    general_nav = self._get_navigation_data()['general_navigation']
+                    return f"### 🧭 General Navigation Information\n\n{general_nav}", "navigation"
+            else:
+                return "Navigation data not available. Please check system initialization.", "error"
+                
+        except Exception as e:
+            logger.error(f"Error in built-in navigation: {e}")
+            return f"Error retrieving navigation data: {str(e)}", "error"
+    
+    def _enhance_search_query(self, query: str, route: RouteDecision) -> str:
+        """Enhance navigation queries with venue information"""
+        if route.is_navigation:
+            return f"{query} IIT Madras Research Park Tharamani Chennai directions"
+        return query
+    
+    def _run_search(self, search_query: str) -> str:
+        with self.metrics.span("serpapi"):
+            return self.search.run(search_query)
+    
+    def get_concurrent_navigation_response(self, query: str, route: RouteDecision) -> Tuple[str, str]:
+        """Run the built-in lookup and the live search at once under ``search_deadline``"""
+        route.mark_live_search()
+        deadline = time.monotonic() + self.search_deadline
+        live_future = _search_executor.submit(self._run_search, self._enhance_search_query(query, route))
+        
+        builtin_response, builtin_type = self.get_built_in_navigation_response(query, route)
+        
+        try:
+            search_results = live_future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FuturesTimeoutError:
+            # Not cancellable once running - let it finish in the pool and ignore it
+            live_future.cancel()
+            logger.warning(f"⏱️ Live search missed the {self.search_deadline}s deadline")
+            return builtin_response + "\n\n*Live updates were not available in time.*", builtin_type
+        except Exception as e:
+            logger.error(f"Search API error: {e}")
+            return builtin_response, builtin_type
+        
+        combined_response = builtin_response + f"\n\n### 🔍 Additional Live Information\n**🔍 Search Results:**\n{search_results}"
+        return combined_response, "navigation"
+    
+    def get_external_search_response(self, query: str, route: Optional[RouteDecision] = None) -> Tuple[str, str]:
+        """Get response from SERP API for external queries"""
+        route = route or self.router.route(query)
+        if not self.search:
+            # For navigation queries, fall back to built-in data
+            if route.is_navigation:
+                return self.get_built_in_navigation_response(query, route)
+            else:
+                return ("🔍 External search is not configured. For navigation queries, I can use built-in Chennai navigation data.", "warning")
+        
+        route.mark_live_search()
+        try:
+            search_results = self._run_search(self._enhance_search_query(query, route))
+            
+            # Format navigation results specifically
+            if route.is_navigation:
+                response = "### 🧭 Live Navigation Information\n\n"
+                response += f"**🔍 Search Results:**\n{search_results}\n\n"
+                
+                # Add built-in navigation as supplementary info
+                builtin_response, _ = self.get_built_in_navigation_response(query, route)
+                response += f"\n### 📋 Built-in Navigation Guide\n\n"
+                response += builtin_response.replace("### 🧭 Navigation Directions\n\n", "")
+                
+            else:
+                response = f"### 🔍 Search Results\n\n{search_results}"
+            
+            return response, "external"
+        
+        except SearchUnavailable as e:
+            # Outage, timeout or open circuit: answer from built-in data without waiting
+            logger.warning(f"⚠️ Live search unavailable: {e}")
+            if route.is_navigation:
+                return self.get_built_in_navigation_response(query, route)
+            response, response_type = self.simple_similarity_search(query, route)
+            return response + "\n\n*Live search is temporarily unavailable - showing event information instead.*", response_type
+            
+        except Exception as e:
+            logger.error(f"Search API error: {e}")
+            # Fallback to built-in data for navigation
+            if route.is_navigation:
+                return self.get_built_in_navigation_response(query, route)
+            else:
+                return f"❌ Search failed: {str(e)}", "error"
+    
+    def confidence_band(self, query: str, route: Optional[RouteDecision] = None) -> Tuple[str, List[Tuple[Document, float]]]:
+        """Classify retrieval confidence from the top FAISS score: high, middle or low.
+
+        Embeddings are L2-normalized, so the squared L2 distance d maps to cosine
+        similarity 1 - d / 2. In hybrid mode a strong BM25 match lifts low to middle.
+        """
+        scored = self.cached_similarity_search(query, k=1, route=route, with_scores=True)
+        if not scored:
+            return "low", scored
+        similarity = 1 - scored[0][1] / 2
+        if similarity >= HIGH_CONFIDENCE:
+            return "high", scored
+        if similarity < LOW_CONFIDENCE:
+            if self.retrieval_mode == "hybrid" and self._strong_lexical_match(query):
+                return "middle", scored  # the hybrid context holds the exact match
+            return "low", scored
+        return "middle", scored
+    
+    def _strong_lexical_match(self, query: str) -> bool:
+        if not self.sparse_index:
+            return False
+        coverage, numbers_matched = self.sparse_index.best_match_coverage(query, ignore=EXTRACTIVE_STOPWORDS)
+        return coverage >= LEXICAL_COVERAGE or numbers_matched
+    
+    def _record_gate(self, band: str):
+        with self._gate_lock:
+            self.gate_decisions[band] = self.gate_decisions.get(band, 0) + 1
+    
+    def _extractive_answer(self, query: str, doc: Document) -> Tuple[str, str]:
+        """Answer from the lines of the top chunk that share the most terms with the query"""
+        query_terms = set(BM25Index.tokenize(query)) - EXTRACTIVE_STOPWORDS
+        lines = [line.strip() for line in doc.page_content.splitlines() if line.strip()]
+        overlaps = [len(query_terms & set(BM25Index.tokenize(line))) for line in lines]
+        best = sorted(range(len(lines)), key=lambda i: overlaps[i], reverse=True)[:EXTRACTIVE_MAX_LINES]
+        selected = [lines[i] for i in sorted(best) if overlaps[i] > 0]
+        
+        response = "### 📄 Event Information\n\n" + ("\n".join(selected) if selected else doc.page_content)
+        response += f"\n\n---\n*Sources: {doc.metadata['source']}*"
+        return response, "document"
+    
+    def _low_confidence_response(self, query: str, route: RouteDecision) -> Tuple[str, str]:
+        """Nothing in the event documents matches well, so don't ask the LLM"""
+        if route.is_navigation:
+            return self.get_built_in_navigation_response(query, route)
+        if self.search:
+            return self.get_external_search_response(query, route)
+        return ("🤔 I couldn't find this in the event information. Try asking about the schedule, "
+                "venue, navigation or event guidelines.", "warning")
+    
+    def get_document_response(self, query: str, route: Optional[RouteDecision] = None) -> Tuple[str, str]:
+        """Get response from document knowledge base"""
+        route = route or self.router.route(query)
+        if not self.qa_chain:
+            return self.simple_similarity_search(query, route)
+        
+        try:
+            # Only the middle confidence band pays for the LLM
+            band, scored = self.confidence_band(query, route)
+            self._record_gate(band)
+            if band == "high":
+                return self._extractive_answer(query, scored[0][0])
+            if band == "low":
+                return self._low_confidence_response(query, route)
+            
+            # Retrieve and pack up front (cached) so the llm span measures only the completion
+            _, raw_tokens, packed_tokens = self.packed_context(query, route)
+            self._record_context(raw_tokens, packed_tokens)
+            with self.metrics.span("llm"):
+                result = self.qa_chain({"query": query})
+            response_text = result['result'].lower()
+            
+            # Check if the model doesn't have the answer
+            if any(phrase in response_text for phrase in [
+                "i don't know", "i do not know", "no information", 
+                "not provided", "not specified", "not mentioned"
+            ]):
+                # For navigation queries, try built-in data
+                if route.is_navigation:
+                    return self.get_built_in_navigation_response(query, route)
+                elif route.is_external:
+                    return self.get_external_search_response(query, route)
+            
+            # Format the response
+            response = f"### 📄 Event Information\n\n{result['result']}"
+            
+            # Add source information
+            sources = list(set([doc.metadata['source'] for doc in result['source_documents']]))
+            response += f"\n\n---\n*Sources: {', '.join(sources)}*"
+            
+            return response, "document"
+            
+        except Exception as e:
+            logger.error(f"QA chain error: {e}")
+            return f"❌ Error processing query: {str(e)}", "error"
+    
+    def classify(self, query: str) -> RouteDecision:
+        """Route a query once per request; pass the decision to the answer methods"""
+        with self.metrics.span("intent"):
+            return self.router.route(query)
+    
+    def supports_streaming(self, query: str, route: Optional[RouteDecision] = None) -> bool:
+        """True when the query would be answered by the LLM and can be streamed"""
+        route = route or self.classify(query)
+        if self.qa_chain is None or route.is_navigation or route.is_external:
+            return False
+        if self.quick_answer(query) or self.schedule_index.answer(query) is not None:
+            return False
+        return self.confidence_band(query, route)[0] == "middle"
+    
+    def stream_response(self, query: str, route: Optional[RouteDecision] = None) -> Iterator[str]:
+        """Yield the answer incrementally: retrieval header first, then LLM tokens as they arrive.
+
+        Uses the same documents and prompt as the RetrievalQA "stuff" chain. Queries that
+        do not go through the LLM are yielded as a single complete response. A ``route``
+        that ``supports_streaming`` accepted skips classifying and checking again.
+        """
+        if route is None:
+            route = self.classify(query)
+            if not self.supports_streaming(query, route):
+                response, _ = self.get_response(query, route)
+                yield response
+                return
+        
+        with self.metrics.span("total"):
+            yield from self._stream_llm_response(query, route)
+    
+    def _stream_llm_response(self, query: str, route: RouteDecision) -> Iterator[str]:
+        self._record_gate("middle")
+        try:
+            docs, raw_tokens, packed_tokens = self.packed_context(query, route)
+            self._record_context(raw_tokens, packed_tokens)
+            yield "### 📄 Event Information\n\n"
+            
+            prompt = QA_PROMPT.format(
+                context="\n\n".join(doc.page_content for doc in docs),
+                question=query
+            )
+            llm_start = time.perf_counter()
+            first_token = True
+            for chunk in self.llm.stream(prompt):
+                if first_token:
+                    self.metrics.record("llm_first_token", (time.perf_counter() - llm_start) * 1000)
+                    first_token = False
+                # LLMs stream strings, chat models stream message chunks
+                yield getattr(chunk, "content", chunk)
+            self.metrics.record("llm", (time.perf_counter() - llm_start) * 1000)
+            
+            sources = list(set([doc.metadata['source'] for doc in docs]))
+            yield f"\n\n---\n*Sources: {', '.join(sources)}*"
+            
+        except Exception as e:
+            logger.error(f"Streaming QA error: {e}")
+            yield f"\n\n❌ Error processing query: {str(e)}"
+    
+    def simple_similarity_search(self, query: str, route: Optional[RouteDecision] = None) -> Tuple[str, str]:
+        """Enhanced fallback method when OpenAI API is not available"""
+        route = route or self.router.route(query)
+        if not self.vectorstore:
+            return "System not properly initialized.", "error"
+            
+        try:
+            # For navigation queries, prioritize navigation documents
+            if route.is_navigation:
+                nav_docs = self.cached_similarity_search(query, k=2, route=route, doc_type="navigation")
+                if nav_docs:
+                    response = "### 🧭 Navigation Information\n\n"
+                    response += nav_docs[0].page_content
+                    return response, "navigation"
+            
+            docs = self.cached_similarity_search(query, k=5, route=route)
+            
+            if not docs:
+                return "No relevant information found.", "warning"
+            
+            # General response formatting
+            response = "### 📄 Relevant Information\n\n"
+            for i, doc in enumerate(docs[:3], 1):
+                content = doc.page_content[:500] if len(doc.page_content) > 500 else doc.page_content
+                response += f"**{i}. {content}**\n\n"
+            
+            return response, "document"
+            
+        except Exception as e:
+            logger.error(f"Similarity search error: {e}")
+            return f"❌ Error in similarity search: {str(e)}", "error"
+    
+    def get_response(self, query: str, route: Optional[RouteDecision] = None) -> Tuple[str, str]:
+        """Main method to get response using appropriate strategy"""
+        with self.metrics.span("total"):
+            return self._get_response(query, route)
+    
+    def _get_response(self, query: str, route: Optional[RouteDecision] = None) -> Tuple[str, str]:
+        try:
+            # Quick actions (and queries normalizing to them) are precomputed
+            quick = self.quick_answer(query)
+            if quick:
+                return quick
+            
+            # Classify once and pass the decision down the call chain
+            if route is None:
+                route = self.classify(query)
+            
+            # Time-based schedule questions are answered straight from the interval index
+            if not (route.is_navigation or route.is_external):
+                with self.metrics.span("schedule"):
+                    schedule_answer = self.schedule_index.answer(query)
+                if schedule_answer:
+                    return schedule_answer, "document"
+            
+            # Navigation queries - prioritize built-in comprehensive data
+            if route.is_navigation:
+                # Fan out to built-in data and live search together
+                if self.search and not route.is_external and self.concurrent_search:
+                    return self.get_concurrent_navigation_response(query, route)
+                
+                # Try built-in navigation first (more reliable and comprehensive)
+                builtin_response, builtin_type = self.get_built_in_navigation_response(query, route)
+                
+                # If external search is available, supplement with live data
+                if self.search and not route.is_external:
+                    try:
+                        external_response, _ = self.get_external_search_response(query, route)
+                        combined_response = builtin_response + f"\n\n### 🔍 Additional Live Information\n{external_response}"
+                        return combined_response, "navigation"
+                    except:
+                        # If external search fails, return built-in data
+                        return builtin_response, builtin_type
+                else:
+                    return builtin_response, builtin_type
+            
+            # External queries (weather, live traffic, etc.)
+            elif route.is_external:
+                return self.get_external_search_response(query, route)
+            
+            # Event-related queries
+            else:
+                return self.get_document_response(query, route)
+                
+        except Exception as e:
+            logger.error(f"Error in get_response: {e}")
+            return f"❌ System error: {str(e)}", "error"
+
+    def _prefetch_searches(self, queries: List[str], vectors: np.ndarray, routes: List[RouteDecision],
+                           doc_type: Optional[str] = None):
+        """One matrix FAISS search for all queries, seeding each request's search memo"""
+        index = self.partitions.get(doc_type) if doc_type else self.vectorstore
+        ks = BATCH_SEARCH_KS[doc_type or ALL_DOCUMENTS]
+        if index is None or not queries:
+            return
+        with self.metrics.span("batch_faiss_search"):
+            distances, rows = index.index.search(vectors, max(ks))
+        for query, route, row_distances, row_ids in zip(queries, routes, distances, rows):
+            scored = [
+                (index.docstore.search(index.index_to_docstore_id[i]), float(distance))
+                for distance, i in zip(row_distances, row_ids) if i != -1
+            ]
+            # The exact index returns the same order for any k, so smaller k are prefixes
+            for k in ks:
+                route.search_memo[("search", query, k, doc_type)] = scored[:k]
+    
+    def get_responses(self, queries: List[str]) -> Tuple[List[Tuple[str, str]], Dict[str, float]]:
+        """Answer a batch of queries: one embedding call and one matrix search per index.
+
+        Returns the (text, type) answers in query order and the batch timing in milliseconds.
+        """
+        timing: Dict[str, float] = {}
+        start = time.perf_counter()
+        routes = [self.router.route(query) for query in queries]
+        
+        # Quick-action and schedule answers and repeated queries need no embedding
+        retrieving = [
+            i for i, (query, route) in enumerate(zip(queries, routes))
+            if not self.quick_answer(query)
+            and (route.is_navigation or route.is_external or self.schedule_index.answer(query) is None)
+        ]
+        unique = list(dict.fromkeys(queries[i] for i in retrieving))
+        if unique and self.embeddings and self.vectorstore:
+            cached = {query: self._vector_cache.get(query) for query in unique}
+            missing = [query for query, vector in cached.items() if vector is None]
+            embed_start = time.perf_counter()
+            if missing:
+                with self.metrics.span("batch_embedding"):
+                    for query, vector in zip(missing, self.embeddings.embed_documents(missing)):
+                        cached[query] = vector
+                        self._vector_cache.put(query, vector)
+            timing["embedding_ms"] = (time.perf_counter() - embed_start) * 1000
+            
+            search_start = time.perf_counter()
+            for i in retrieving:
+                routes[i].search_memo[("vector", queries[i])] = cached[queries[i]]
+            matrix = np.asarray([cached[queries[i]] for i in retrieving], dtype=np.float32)
+            self._prefetch_searches([queries[i] for i in retrieving], matrix, [routes[i] for i in retrieving])
+            navigation = [n for n, i in enumerate(retrieving) if routes[i].is_navigation]
+            self._prefetch_searches(
+                [queries[retrieving[n]] for n in navigation], matrix[navigation],
+                [routes[retrieving[n]] for n in navigation], doc_type="navigation"
+            )
+            timing["faiss_search_ms"] = (time.perf_counter() - search_start) * 1000
+        
+        # Answers only hit the seeded memos; LLM and live search calls overlap
+        answer_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(BATCH_WORKERS, len(queries)))) as pool:
+            responses = list(pool.map(self.get_response, queries, routes))
+        timing["answer_ms"] = (time.perf_counter() - answer_start) * 1000
+        timing["total_ms"] = (time.perf_counter() - start) * 1000
+        return responses, timing
+
+# Quick-action buttons in main(): (label, help text, query)
+QUICK_ACTIONS = [
+    ("📅 Full Schedule", "Get detailed 2-day schedule", "What is the detailed schedule for both days?"),
+    ("🧭 From Guindy", "Directions from Guindy", "How to reach the venue from Guindy? Include all transport options."),
+    ("🚇 Public Transport", "Bus, Metro, Train options", "What are all the public transport options to reach the venue?"),
+    ("📍 Venue Details", "Location and facilities", "Tell me about the venue location and facilities"),
+    ("✈️ From Airport", "Airport to venue directions", "How to reach from Chennai Airport to the venue?"),
+    ("🅿️ Parking Info", "Parking and entry details", "What are the parking arrangements and entry requirements?"),
+    ("💰 Travel Costs", "Cost estimates for different modes", "What are the travel costs from different parts of Chennai?"),
+    ("📱 Event Guidelines", "Social media and other guidelines", "What are the event guidelines and social media rules?"),
+]
+
+class EventRegistry:
+    """RAG systems keyed by event id, loaded on first access and evicted LRU under a memory cap.
+
+    Each event has its own corpus directory, FAISS indexes and on-disk index cache, so a
+    (re)load only reads the persisted indexes. All events share one embeddings model and LLM.
+    """
+    
+    def __init__(self, events_dir: Optional[str] = EVENTS_DIR, memory_cap_mb: float = EVENT_MEMORY_CAP_MB,
+                 llm: Optional[BaseLanguageModel] = None):
+        self.events_dir = events_dir
+        self.memory_cap = int(memory_cap_mb * 1024 * 1024)
+        self.llm = llm
+        self.embeddings: Optional[Embeddings] = None
+        self.loads = 0
+        self.evictions = 0
+        self._systems: "OrderedDict[str, EnhancedEventRAGSystem]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}  # one loader per event at a time
+    
+    def event_ids(self) -> List[str]:
+        """The built-in event followed by every event directory"""
+        ids = [DEFAULT_EVENT_ID]
+        if self.events_dir and os.path.isdir(self.events_dir):
+            ids += sorted(
+                name for name in os.listdir(self.events_dir)
+                if EVENT_ID_PATTERN.fullmatch(name) and os.path.isdir(os.path.join(self.events_dir, name))
+            )
+        return ids
+    
+    def _corpus_dir(self, event_id: str) -> Optional[str]:
+        if event_id == DEFAULT_EVENT_ID:
+            return CORPUS_DIR
+        # Event ids are directory names, never paths
+        if self.events_dir and EVENT_ID_PATTERN.fullmatch(event_id):
+            path = os.path.join(self.events_dir, event_id)
+            if os.path.isdir(path):
+                return path
+        raise KeyError(f"Unknown event: {event_id}")
+    
+    def loaded(self) -> List[str]:
+        """Loaded event ids, least recently used first"""
+        with self._lock:
+            return list(self._systems)
+    
+    def get(self, event_id: str = DEFAULT_EVENT_ID) -> EnhancedEventRAGSystem:
+        """The event's RAG system, loading it (and evicting others) if needed"""
+        with self._lock:
+            system = self._systems.get(event_id)
+            if system is not None:
+                self._systems.move_to_end(event_id)
+                return system
+        # Unknown ids raise KeyError here, before any per-event state is created
+        corpus_dir = self._corpus_dir(event_id)
+        with self._lock:
+            load_lock = self._loading.setdefault(event_id, threading.Lock())
+        
+        # Other events keep being served while this one loads
+        try:
+            with load_lock:
+                with self._lock:
+                    system = self._systems.get(event_id)
+                    if system is not None:
+                        self._systems.move_to_end(event_id)
+                        return system
+                
+                system = EnhancedEventRAGSystem(
+                    llm=self.llm, corpus_dir=corpus_dir,
+                    embeddings=self.embeddings, event_id=event_id
+                )
+                with self._lock:
+                    self.embeddings = self.embeddings or system.embeddings
+                    self.llm = self.llm or system.llm
+                    self._systems[event_id] = system
+                    self.loads += 1
+                    self._evict(keep=event_id)
+                logger.info(f"📂 Loaded event '{event_id}' ({system.memory_bytes() / 2**20:.1f} MB)")
+                return system
+        finally:
+            # Also after a failed load, so the next request retries with a fresh lock
+            with self._lock:
+                if self._loading.get(event_id) is load_lock:
+                    del self._loading[event_id]
+    
+    def _evict(self, keep: str):
+        """Drop least recently used events until the loaded indexes fit under the cap.
+
+        Requests still holding an evicted system finish normally; it is freed afterwards.
+        """
+        sizes = {event_id: system.memory_bytes() for event_id, system in self._systems.items()}
+        total = sum(sizes.values())
+        for event_id in list(self._systems):
+            if total <= self.memory_cap:
+                break
+            if event_id == keep:
+                continue
+            del self._systems[event_id]
+            total -= sizes[event_id]
+            self.evictions += 1
+            logger.info(f"♻️ Evicted event '{event_id}' ({sizes[event_id] / 2**20:.1f} MB)")
+
+# Process-wide registry of events
+_event_registry: Optional[EventRegistry] = None
+_shared_rag_lock = threading.Lock()
+
+def get_event_registry() -> EventRegistry:
+    """Return the single process-wide event registry, creating it on first use"""
+    global _event_registry
+    if _event_registry is None:
+        with _shared_rag_lock:
+            if _event_registry is None:
+                _event_registry = EventRegistry()
+    return _event_registry
+
+def get_shared_rag_system(event_id: str = DEFAULT_EVENT_ID) -> EnhancedEventRAGSystem:
+    """Return the process-wide RAG system of an event, building it on first use.
+
+    The embeddings model and FAISS index are loaded once and then only read,
+    so concurrent ``similarity_search`` calls from many sessions are safe.
+    """
+    return get_event_registry().get(event_id)
@@ -0,0 +1,142 @@
+"""ONNX Runtime backend for all-MiniLM-L6-v2 sentence embeddings.
+
+Runs an exported (optionally int8 dynamic-quantized) MiniLM through onnxruntime
+instead of PyTorch, behind the LangChain ``Embeddings`` interface. It also has a
+SentenceTransformer-style ``encode`` so it can replace the model in AgenticRAG.py.
+
+Export once (needs torch + transformers, only for this step):
+    python onnx_embeddings.py export [--quantize]
+
+Select it in the RAG apps with RAG_EMBEDDING_BACKEND=onnx or onnx-int8.
+"""
+import argparse
+import os
+from typing import List, Union
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+MAX_SEQ_LENGTH = 256  # same truncation as the sentence-transformers model
+ONNX_MODEL_DIR = os.getenv(
+    "RAG_ONNX_MODEL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".onnx_minilm")
+)
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model-int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class ONNXMiniLMEmbeddings(Embeddings):
+    """Mean-pooled, L2-normalized MiniLM embeddings computed with onnxruntime"""
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR, quantized: bool = False,
+                 batch_size: int = 64, num_threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(model_dir, QUANTIZED_MODEL_FILE if quantized else MODEL_FILE)
+        if not os.path.isfile(model_path):
+            raise FileNotFoundError(
+                f"{model_path} not found - run 'python onnx_embeddings.py export"
+                f"{' --quantize' if quantized else ''}' first"
+            )
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads  # 0 lets onnxruntime decide
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+        self.batch_size = batch_size
+        self.model_name = f"{MODEL_NAME} (onnx{'-int8' if quantized else ''})"
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, then L2 normalization (as in the ST pipeline)
+        mask = attention_mask[:, :, None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        pooled = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = None, **kwargs) -> np.ndarray:
+        """SentenceTransformer-compatible encode returning a float32 array"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        batch_size = batch_size or self.batch_size
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # Sort by length so each batch pads to a similar length, then restore order
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors = np.empty((len(texts), 0), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            embedded = self._encode_batch([texts[i] for i in batch])
+            if vectors.shape[1] == 0:
+                vectors = np.empty((len(texts), embedded.shape[1]), dtype=np.float32)
+            vectors[batch] = embedded
+        return vectors[0] if single else vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+
+def export_model(model_dir: str = ONNX_MODEL_DIR, quantize: bool = False):
+    """Export the Hugging Face model to ONNX and optionally add an int8 copy"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    os.makedirs(model_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = AutoModel.from_pretrained(MODEL_NAME).eval()
+    tokenizer.backend_tokenizer.save(os.path.join(model_dir, TOKENIZER_FILE))
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    dynamic = {0: "batch", 1: "sequence"}
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+        os.path.join(model_dir, MODEL_FILE),
+        input_names=["input_ids", "attention_mask", "token_type_ids"],
+        output_names=["last_hidden_state"],
+        dynamic_axes={
+            "input_ids": dynamic, "attention_mask": dynamic,
+            "token_type_ids": dynamic, "last_hidden_state": dynamic,
+        },
+        opset_version=14,
+    )
+    print(f"exported {os.path.join(model_dir, MODEL_FILE)}")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(
+            os.path.join(model_dir, MODEL_FILE),
+            os.path.join(model_dir, QUANTIZED_MODEL_FILE),
+            weight_type=QuantType.QInt8,
+        )
+        print(f"quantized {os.path.join(model_dir, QUANTIZED_MODEL_FILE)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ONNX MiniLM embedding backend")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Export the model to ONNX")
+    export.add_argument("--model-dir", default=ONNX_MODEL_DIR)
+    export.add_argument("--quantize", action="store_true", help="also write an int8 copy")
+    args = parser.parse_args()
+    export_model(args.model_dir, args.quantize)
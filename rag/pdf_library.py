@@ -0,0 +1,149 @@
+"""Persistent multi-document PDF library for simpleRAG.
+
+All ingested PDFs share one FAISS store on disk. Each PDF is a namespace named
+after its content hash: chunk ids are ``<doc_id>:<n>`` and every chunk carries
+``doc_id``/``source``/``chunk`` metadata. Adding a PDF embeds only its own chunks
+and appends them to the index. Queries can be limited to any subset of documents
+with a FAISS ID selector, so nothing is reloaded or rebuilt per scope.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from pdf_pipeline import embed_stream, extract_pages, stream_chunks
+
+LIBRARY_DIR = os.getenv(
+    "SIMPLE_RAG_LIBRARY_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".simple_rag_library")
+)
+DOCUMENTS_FILE = "documents.json"
+
+
+class PDFLibrary:
+    """One persistent vector store holding many PDFs, each in its own namespace"""
+
+    def __init__(self, embeddings, path: str = LIBRARY_DIR, chunk_size: int = 1000, chunk_overlap: int = 200):
+        self.embeddings = embeddings
+        self.path = path
+        self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.vectorstore: Optional[FAISS] = None
+        self.documents: Dict[str, dict] = {}  # doc_id -> name, pages, chunk ids, added
+        self._lock = threading.RLock()  # FAISS indexes can't be searched while being appended to
+
+        if os.path.isfile(os.path.join(path, DOCUMENTS_FILE)):
+            with open(os.path.join(path, DOCUMENTS_FILE), encoding="utf-8") as f:
+                self.documents = json.load(f)
+            if self.documents:
+                self.vectorstore = FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+
+    @staticmethod
+    def document_id(pdf_bytes: bytes) -> str:
+        return hashlib.sha256(pdf_bytes).hexdigest()[:16]
+
+    def _save(self):
+        """Write the store and the document list next to the library, then swap directories"""
+        parent = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(parent, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(prefix=".tmp-library-", dir=parent)
+        if self.vectorstore is not None:
+            self.vectorstore.save_local(tmp_path)
+        with open(os.path.join(tmp_path, DOCUMENTS_FILE), "w", encoding="utf-8") as f:
+            json.dump(self.documents, f)
+
+        old_path = None
+        if os.path.exists(self.path):
+            old_path = tempfile.mkdtemp(prefix=".old-library-", dir=parent)
+            os.replace(self.path, os.path.join(old_path, "library"))
+        os.replace(tmp_path, self.path)
+        if old_path:
+            shutil.rmtree(old_path, ignore_errors=True)
+
+    def add_pdf(self, name: str, pdf_bytes: bytes) -> Tuple[str, bool]:
+        """Append a PDF's chunks to the library; returns (doc_id, whether it was new)"""
+        doc_id = self.document_id(pdf_bytes)
+        if doc_id in self.documents:
+            return doc_id, False
+
+        # Extraction and embedding happen outside the lock; only the append blocks searches
+        page_count = 0
+
+        def page_texts():
+            nonlocal page_count
+            for page_number, text in extract_pages(pdf_bytes):
+                page_count = page_number + 1
+                yield text
+
+        chunks, vectors = embed_stream(stream_chunks(page_texts(), self.text_splitter), self.embeddings)
+        if not chunks:
+            raise ValueError(f"No text found in {name}.")
+        chunk_ids = [f"{doc_id}:{i}" for i in range(len(chunks))]
+        metadatas = [{"doc_id": doc_id, "source": name, "chunk": i} for i in range(len(chunks))]
+
+        with self._lock:
+            if doc_id in self.documents:
+                return doc_id, False
+            if self.vectorstore is None:
+                self.vectorstore = FAISS.from_embeddings(
+                    list(zip(chunks, vectors)), self.embeddings, metadatas=metadatas, ids=chunk_ids
+                )
+            else:
+                self.vectorstore.add_embeddings(list(zip(chunks, vectors)), metadatas=metadatas, ids=chunk_ids)
+            self.documents[doc_id] = {
+                "name": name, "pages": page_count, "chunks": len(chunks), "added": time.time(),
+            }
+            self._save()
+        return doc_id, True
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            entry = self.documents.pop(doc_id, None)
+            if entry is None:
+                return
+            self.vectorstore.delete([f"{doc_id}:{i}" for i in range(entry["chunks"])])
+            if not self.documents:
+                self.vectorstore = None
+            self._save()
+
+    def search(self, query: str, doc_ids: Optional[List[str]] = None, k: int = 4) -> List[Document]:
+        """Top-k chunks, only from ``doc_ids`` when given"""
+        vector = np.asarray([self.embeddings.embed_query(query)], dtype=np.float32)
+        with self._lock:
+            store = self.vectorstore
+            if store is None:
+                return []
+            params = None
+            if doc_ids is not None:
+                wanted = set(doc_ids)
+                rows = [row for row, chunk_id in store.index_to_docstore_id.items()
+                        if chunk_id.split(":", 1)[0] in wanted]
+                if not rows:
+                    return []
+                # Exact search restricted to the chosen documents' rows
+                params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(np.asarray(rows, dtype=np.int64)))
+            _, ids = store.index.search(vector, k, params=params)
+            return [store.docstore.search(store.index_to_docstore_id[i]) for i in ids[0] if i != -1]
+
+    def as_retriever(self, doc_ids: Optional[List[str]] = None, k: int = 4) -> "LibraryRetriever":
+        return LibraryRetriever(library=self, doc_ids=doc_ids, k=k)
+
+
+class LibraryRetriever(BaseRetriever):
+    """Retriever over a subset of the library's documents"""
+    library: Any
+    doc_ids: Optional[List[str]] = None
+    k: int = 4
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> List[Document]:
+        return self.library.search(query, self.doc_ids, self.k)
@@ -0,0 +1,119 @@
+"""Parallel, streaming PDF ingestion shared by the PDF apps (simpleRAG.py, coverLetter).
+
+``extract_pages`` parses page batches in a process pool and yields page text in
+order as soon as each batch is ready. ``stream_chunks`` splits that stream
+incrementally, and ``embed_stream`` sends chunk batches to the embedding model
+while later pages are still being parsed. Small documents are read serially,
+because starting worker processes would cost more than it saves.
+"""
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from PyPDF2 import PdfReader
+
+PAGES_PER_TASK = 16
+PARALLEL_MIN_PAGES = 48  # below this a single process is faster
+EMBED_BATCH_SIZE = 64
+EMBED_WORKERS = 4
+
+# Set in each worker process by the pool initializer
+_worker_reader = None
+
+
+def _init_worker(pdf_bytes: bytes):
+    global _worker_reader
+    _worker_reader = PdfReader(io.BytesIO(pdf_bytes))
+
+
+def _extract_range(page_range: Tuple[int, int]) -> List[str]:
+    start, end = page_range
+    return [_worker_reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (container limits included where the OS exposes them)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _read_bytes(source: Union[bytes, str, io.IOBase]) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    if hasattr(source, "getvalue"):  # Streamlit UploadedFile, BytesIO
+        return source.getvalue()
+    return source.read()
+
+
+def extract_pages(source: Union[bytes, str, io.IOBase], workers: int = None) -> Iterator[Tuple[int, str]]:
+    """Yield (page number, text) in page order, extracting page batches in parallel"""
+    pdf_bytes = _read_bytes(source)
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    n_pages = len(reader.pages)
+    workers = workers or available_cpus()
+
+    if n_pages < PARALLEL_MIN_PAGES or workers < 2:
+        for i, page in enumerate(reader.pages):
+            yield i, page.extract_text() or ""
+        return
+
+    ranges = [(start, min(start + PAGES_PER_TASK, n_pages)) for start in range(0, n_pages, PAGES_PER_TASK)]
+    # spawn: forking a threaded Streamlit server is unsafe
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=get_context("spawn"),
+                             initializer=_init_worker, initargs=(pdf_bytes,)) as pool:
+        # map() yields batches in order, each as soon as it and its predecessors are done
+        for (start, _), texts in zip(ranges, pool.map(_extract_range, ranges)):
+            for offset, text in enumerate(texts):
+                yield start + offset, text
+
+
+def extract_text(source: Union[bytes, str, io.IOBase], workers: int = None) -> str:
+    """Whole-document text, joined once instead of with repeated ``+=``"""
+    return "".join(text for _, text in extract_pages(source, workers))
+
+
+def stream_chunks(texts: Iterable[str], text_splitter, buffer_chunks: int = 8) -> Iterator[str]:
+    """Split a stream of page texts into chunks without holding the whole document.
+
+    Text is buffered until it spans roughly ``buffer_chunks`` chunks. Every chunk
+    except the last is emitted, and splitting restarts at the last chunk, so
+    chunks can span page boundaries and keep the splitter's size and overlap.
+    """
+    threshold = text_splitter._chunk_size * buffer_chunks
+    buffer = ""
+    for text in texts:
+        buffer += text  # bounded by the threshold, not the document
+        if len(buffer) < threshold:
+            continue
+        chunks = text_splitter.split_text(buffer)
+        yield from chunks[:-1]
+        if chunks:
+            buffer = buffer[buffer.rfind(chunks[-1]):]
+    if buffer.strip():
+        yield from text_splitter.split_text(buffer)
+
+
+def embed_stream(chunks: Iterable[str], embeddings, batch_size: int = EMBED_BATCH_SIZE,
+                 workers: int = EMBED_WORKERS) -> Tuple[List[str], List[List[float]]]:
+    """Embed chunk batches concurrently as they arrive; returns texts and vectors in order"""
+    texts: List[str] = []
+    futures = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed-stream") as pool:
+        batch: List[str] = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) == batch_size:
+                futures.append(pool.submit(embeddings.embed_documents, batch))
+                texts.extend(batch)
+                batch = []
+        if batch:
+            futures.append(pool.submit(embeddings.embed_documents, batch))
+            texts.extend(batch)
+        vectors = [vector for future in futures for vector in future.result()]
+    return texts, vectors
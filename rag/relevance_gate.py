@@ -0,0 +1,127 @@
+"""Local relevance gate for AgenticRAG: do the retrieved chunks answer the question?
+
+AgenticRAG used to ask a gpt-4o verifier on every question whether the document
+context was good enough, or whether to fall back to web search. Most questions
+are clear-cut, so ``RelevanceGate`` decides in up to three stages:
+
+1. the FAISS distance of the best chunk (embeddings are normalized, so squared
+   L2 distance is ``2 - 2 * cosine``): close enough means the documents answer
+   it, far enough means they don't
+2. optionally, a small cross-encoder run on CPU, only for questions in the
+   ambiguous distance band
+3. the LLM verifier, only when both local scores fall in their ambiguous bands
+
+The thresholds come from ``calibrate_gate.py``, which fits them to labeled
+questions and reports how many verifier calls they avoid.
+"""
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+RELEVANT_DISTANCE = float(os.getenv("RAG_GATE_RELEVANT_DISTANCE", "0.7"))  # cosine >= 0.65
+IRRELEVANT_DISTANCE = float(os.getenv("RAG_GATE_IRRELEVANT_DISTANCE", "1.3"))  # cosine <= 0.35
+# Empty disables the cross-encoder stage
+CROSS_ENCODER_MODEL = os.getenv("RAG_GATE_CROSS_ENCODER", "")
+RERANK_RELEVANT = float(os.getenv("RAG_GATE_RERANK_RELEVANT", "3.0"))
+RERANK_IRRELEVANT = float(os.getenv("RAG_GATE_RERANK_IRRELEVANT", "-3.0"))
+RERANK_TOP_K = 3  # chunks scored by the cross-encoder
+
+# (chunk text, location, distance) as returned by PDFIndex.search
+SearchResult = Tuple[str, tuple, float]
+
+
+def load_cross_encoder(model_name: str = CROSS_ENCODER_MODEL):
+    """CPU cross-encoder, e.g. cross-encoder/ms-marco-MiniLM-L-6-v2; None when disabled"""
+    if not model_name:
+        return None
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(model_name, device="cpu", max_length=512)
+
+
+class RelevanceGate:
+    """Decides locally when it can and counts the verifier calls it avoided"""
+
+    def __init__(self, verifier: Optional[Callable[[str, str], bool]] = None, cross_encoder=None,
+                 relevant_distance: float = RELEVANT_DISTANCE, irrelevant_distance: float = IRRELEVANT_DISTANCE,
+                 rerank_relevant: float = RERANK_RELEVANT, rerank_irrelevant: float = RERANK_IRRELEVANT):
+        self.verifier = verifier  # (context, query) -> whether the context answers the query
+        self.cross_encoder = cross_encoder
+        self.relevant_distance = relevant_distance
+        self.irrelevant_distance = irrelevant_distance
+        self.rerank_relevant = rerank_relevant
+        self.rerank_irrelevant = rerank_irrelevant
+        self.stats: Dict[str, int] = {"questions": 0, "distance": 0, "cross-encoder": 0, "llm": 0}
+        self._lock = threading.Lock()
+
+    def rerank_score(self, query: str, results: Sequence[SearchResult]) -> Optional[float]:
+        """Best cross-encoder logit over the top chunks, or None without a cross-encoder"""
+        if self.cross_encoder is None or not results:
+            return None
+        pairs = [(query, chunk) for chunk, _, _ in results[:RERANK_TOP_K]]
+        return float(max(self.cross_encoder.predict(pairs)))
+
+    def local_decision(self, query: str, results: Sequence[SearchResult]) -> Tuple[Optional[bool], str]:
+        """(relevant, stage) from the local scores; relevant is None if they are ambiguous"""
+        if not results:
+            return False, "distance"
+        distance = results[0][2]
+        if distance <= self.relevant_distance:
+            return True, "distance"
+        if distance >= self.irrelevant_distance:
+            return False, "distance"
+
+        rerank = self.rerank_score(query, results)
+        if rerank is not None:
+            if rerank >= self.rerank_relevant:
+                return True, "cross-encoder"
+            if rerank <= self.rerank_irrelevant:
+                return False, "cross-encoder"
+        return None, "llm"
+
+    def is_relevant(self, query: str, results: Sequence[SearchResult],
+                    on_escalate: Optional[Callable[[], None]] = None) -> bool:
+        """``on_escalate`` runs just before the verifier is called, e.g. to start work it may need"""
+        relevant, stage = self.local_decision(query, results)
+        if relevant is None:
+            if on_escalate:
+                on_escalate()
+            context = "\n".join(chunk for chunk, _, _ in results)
+            # Without a verifier, ambiguous context is still better than a web search
+            relevant = self.verifier(context, query) if self.verifier else True
+        with self._lock:
+            self.stats["questions"] += 1
+            self.stats[stage] += 1
+        return relevant
+
+    def report(self) -> Dict[str, float]:
+        with self._lock:
+            report = dict(self.stats)
+        report["llm_calls_avoided"] = report["questions"] - report["llm"]
+        report["avoided_rate"] = report["llm_calls_avoided"] / report["questions"] if report["questions"] else 0.0
+        return report
+
+
+def fit_thresholds(scores: List[float], labels: List[bool], precision: float = 0.95) -> Tuple[float, float]:
+    """Thresholds (relevant_at_most, irrelevant_at_least) for a lower-is-better score.
+
+    The first is the largest score below which at least ``precision`` of the
+    questions are relevant, the second the smallest score above which at least
+    ``precision`` are irrelevant. Scores in between go to the next stage.
+    """
+    pairs = sorted(zip(scores, labels))
+    relevant_at_most = float("-inf")
+    correct = 0
+    for n, (score, label) in enumerate(pairs, 1):
+        correct += label
+        if correct / n >= precision:
+            relevant_at_most = score
+
+    irrelevant_at_least = float("inf")
+    correct = 0
+    for n, (score, label) in enumerate(reversed(pairs), 1):
+        correct += not label
+        if correct / n >= precision:
+            irrelevant_at_least = score
+    # Overlapping bands would make the order of the checks decide; close the gap instead
+    return relevant_at_most, max(irrelevant_at_least, relevant_at_most)
@@ -0,0 +1,212 @@
+"""Caching, coalescing and circuit-breaking layer for live web search (SerpAPIWrapper).
+
+``ResilientSearch`` wraps any backend with a ``run(query) -> str`` method:
+
+- results are cached per normalized query for ``ttl`` seconds, in memory and
+  optionally in SQLite so they survive restarts and are shared by processes
+- identical queries already in flight share a single backend call
+- callers wait at most ``timeout`` seconds; a late result still fills the cache
+- after ``failure_threshold`` consecutive failures or timeouts the circuit opens
+  and calls fail immediately with ``SearchUnavailable`` for ``reset_after``
+  seconds, then one trial call decides whether it closes again
+
+Callers catch ``SearchUnavailable`` and fall back to built-in data.
+"""
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SearchUnavailable(Exception):
+    """Live search failed, timed out or is short-circuited"""
+
+
+class SearchTimeout(SearchUnavailable):
+    pass
+
+
+class CircuitOpen(SearchUnavailable):
+    pass
+
+
+def normalize_search_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query.strip().lower())
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open (one trial) -> closed"""
+
+    def __init__(self, failure_threshold: int = 3, reset_after: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a backend call may be made now"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_after:
+                self.state = "half-open"  # let exactly one trial call through
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half-open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class ResilientSearch:
+    """Drop-in replacement for a search wrapper's ``run`` with caching and failure isolation"""
+
+    def __init__(self, backend: Any, ttl: float = 600.0, timeout: float = 5.0,
+                 failure_threshold: int = 3, reset_after: float = 30.0,
+                 db_path: Optional[str] = None, max_entries: int = 1024, max_workers: int = 8):
+        self.backend = backend
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.breaker = CircuitBreaker(failure_threshold, reset_after)
+        self.stats: Dict[str, int] = {
+            "hits": 0, "misses": 0, "coalesced": 0, "backend_calls": 0,
+            "failures": 0, "timeouts": 0, "short_circuited": 0,
+        }
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()  # key -> (expires, result)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resilient-search")
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache (query TEXT PRIMARY KEY, result TEXT, expires REAL)"
+            )
+            self._db.commit()
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    # ----- cache -----
+    def _cached(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+        if self._db is not None:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT result, expires FROM search_cache WHERE query = ?", (key,)
+                ).fetchone()
+            if row and row[1] > now:
+                self._remember(key, row[0], row[1], persist=False)
+                return row[0]
+        return None
+
+    def _remember(self, key: str, result: str, expires: float, persist: bool = True):
+        with self._lock:
+            self._memory[key] = (expires, result)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        if persist and self._db is not None:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO search_cache (query, result, expires) VALUES (?, ?, ?)",
+                    (key, result, expires)
+                )
+                self._db.execute("DELETE FROM search_cache WHERE expires <= ?", (time.time(),))
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM search_cache")
+                self._db.commit()
+
+    # ----- backend calls -----
+    def _call_backend(self, key: str, query: str, future: Future):
+        self._count("backend_calls")
+        try:
+            try:
+                result = self.backend.run(query)
+            except Exception as e:
+                self._count("failures")
+                self.breaker.record_failure()
+                future.set_exception(e)
+                return
+            self.breaker.record_success()
+            # Cache before leaving the in-flight table so no caller misses both
+            try:
+                self._remember(key, result, time.time() + self.ttl)
+            except Exception as e:
+                # e.g. "database is locked": the result is still good for the waiting callers
+                logger.warning(f"Search cache write failed: {e}")
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            if not future.done():
+                future.set_exception(SearchUnavailable("Live search call ended without a result"))
+
+    def run(self, query: str) -> str:
+        """Cached or live search result; raises ``SearchUnavailable`` instead of waiting on outages"""
+        key = normalize_search_query(query)
+        result = self._cached(key)
+        if result is not None:
+            self._count("hits")
+            return result
+
+        with self._lock:
+            future = self._inflight.get(key)
+            coalesced = future is not None
+            if coalesced:
+                self.stats["coalesced"] += 1
+            elif not self.breaker.allow():
+                self.stats["short_circuited"] += 1
+                raise CircuitOpen("Live search is temporarily disabled after repeated failures")
+            else:
+                self.stats["misses"] += 1
+                future = Future()
+                self._inflight[key] = future
+        if not coalesced:
+            self._executor.submit(self._call_backend, key, query, future)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            if not coalesced:
+                # The call keeps running and caches its result if it ever arrives
+                self._count("timeouts")
+                self.breaker.record_failure()
+            raise SearchTimeout(f"Live search took longer than {self.timeout}s")
+        except Exception as e:
+            raise SearchUnavailable(f"Live search failed: {e}") from e
@@ -1,62 +1,168 @@
 import streamlit as st
-from PyPDF2 import PdfReader
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain.vectorstores import FAISS
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains import RetrievalQA
 from dotenv import load_dotenv
+from embedding_cache import CachedEmbeddings
+from pdf_library import PDFLibrary
+from pdf_pipeline import embed_stream, extract_pages, stream_chunks
+import hashlib
 import os
+import shutil
+import tempfile
 
 load_dotenv()
 
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+# Built vector stores on disk, one directory per PDF content hash
+INDEX_CACHE_DIR = os.getenv(
+    "SIMPLE_RAG_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".simple_rag_cache")
+)
+
 llm = ChatOpenAI(api_key=os.getenv("OPENAI_API_KEY"), temperature=0.2, model="gpt-4o")
 
-embeddings = OpenAIEmbeddings()
+# Chunks embedded before (by any build) are served from the local SQLite cache
+embeddings = CachedEmbeddings(OpenAIEmbeddings())
+
+
+def index_key(pdf_bytes):
+    """Content address of the PDF plus every setting that changes the vectors"""
+    digest = hashlib.sha256(pdf_bytes)
+    digest.update(f"|{embeddings.model}|{CHUNK_SIZE}|{CHUNK_OVERLAP}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Streamlit reruns the whole script on every interaction (including typing a
+# question), so the vector store is cached per file hash in memory and on disk:
+# re-asking or re-uploading the same PDF makes no embedding calls.
+@st.cache_resource(show_spinner=False, max_entries=16)
+def load_vectorstore(key, _pdf_bytes):
+    """Return (vectorstore, number of chunks, embedding cache stats or None) for the PDF,
+    building it only once per hash"""
+    path = os.path.join(INDEX_CACHE_DIR, key)
+    if os.path.isdir(path):
+        vectorstore = FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+        return vectorstore, vectorstore.index.ntotal, None
+
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP
+    )
+    # Pages are parsed in parallel and chunked as they arrive; early chunks are
+    # being embedded while later pages are still being extracted
+    page_texts = (text for _, text in extract_pages(_pdf_bytes))
+    before = embeddings.snapshot()
+    chunks, vectors = embed_stream(stream_chunks(page_texts, text_splitter), embeddings)
+    cache_stats = CachedEmbeddings.report(before, embeddings.snapshot())
+    if not chunks:
+        raise ValueError("No text found in the uploaded PDF.")
+
+    vectorstore = FAISS.from_embeddings(list(zip(chunks, vectors)), embedding=embeddings)
+
+    # Write to a temporary directory and rename, so a crash never leaves half an index
+    os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=".tmp-", dir=INDEX_CACHE_DIR)
+    vectorstore.save_local(tmp_path)
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        shutil.rmtree(tmp_path, ignore_errors=True)  # another session saved it first
+    return vectorstore, len(chunks), cache_stats
+
+
+@st.cache_resource(show_spinner=False)
+def load_library():
+    """The persistent document library, shared by all sessions of this process"""
+    return PDFLibrary(embeddings, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+
 
 st.title("RAG App: Ask you pdf Anything")
 
+mode = st.sidebar.radio("Mode", ["Single PDF", "Library"],
+                        help="Library keeps every ingested PDF in one persistent index")
+
+if mode == "Library":
+    library = load_library()
+
+    new_files = st.file_uploader("Add PDFs to the library", type="pdf", accept_multiple_files=True)
+    if new_files and st.button("Add to library"):
+        for new_file in new_files:
+            try:
+                with st.spinner(f"Adding {new_file.name}..."):
+                    _, added = library.add_pdf(new_file.name, new_file.getvalue())
+                if added:
+                    st.success(f"Added {new_file.name}")
+                else:
+                    st.info(f"{new_file.name} is already in the library")
+            except Exception as e:
+                st.error(f"Error adding {new_file.name}: {e}")
+
+    if not library.documents:
+        st.info("The library is empty. Add PDFs to start asking questions.")
+        st.stop()
+
+    doc_ids = list(library.documents)
+    selected = st.multiselect(
+        "Search in", doc_ids, default=doc_ids,
+        format_func=lambda doc_id: f"{library.documents[doc_id]['name']} ({library.documents[doc_id]['pages']} pages)"
+    )
+    with st.sidebar.expander(f"📚 {len(doc_ids)} documents"):
+        for doc_id in doc_ids:
+            entry = library.documents[doc_id]
+            if st.button(f"Remove {entry['name']}", key=f"remove-{doc_id}"):
+                library.remove(doc_id)
+                st.rerun()
+
+    user_question = st.text_input("Ask a question about the selected documents:")
+    if user_question and selected:
+        qa = RetrievalQA.from_chain_type(
+            llm=llm,
+            chain_type="stuff",
+            retriever=library.as_retriever(doc_ids=selected),
+            return_source_documents=True,
+        )
+        with st.spinner("Generating answer..."):
+            result = qa.invoke({"query": user_question})
+            st.write("Answer:")
+            st.write(result["result"])
+            sources = sorted({doc.metadata["source"] for doc in result["source_documents"]})
+            st.caption(f"Sources: {', '.join(sources)}")
+    st.stop()
+
 uploaded_file = st.file_uploader("Upload a PDF file", type="pdf")
 
 if uploaded_file is not None:
-    raw_text = ""
+    qa = None
+    pdf_bytes = uploaded_file.getvalue()
 
     try:
-        pdf_reader = PdfReader(uploaded_file)
-        for page in pdf_reader.pages:
-            text = page.extract_text()
-            if text:
-                raw_text += text
+        with st.spinner("Processing PDF..."):
+            vectorstore, num_chunks, cache_stats = load_vectorstore(index_key(pdf_bytes), pdf_bytes)
+        st.success(f"PDF processed successfully! Number of text chunks created: {num_chunks}")
+        if cache_stats:
+            st.caption(f"Embedding cache: {cache_stats['hits']}/{cache_stats['texts']} chunks reused "
+                       f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['api_calls']} API calls made, "
+                       f"{cache_stats['api_calls_saved']} saved")
 
-    except Exception as e:
-        st.error(f"Error reading PDF file: {e}")
-        
-    if not raw_text.strip():
-        st.error("No text found in the uploaded PDF.")
-
-    else:
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200
+        qa = RetrievalQA.from_chain_type(
+            llm=llm,
+            chain_type="stuff",
+            retriever=vectorstore.as_retriever(),
         )
-        chunks = text_splitter.split_text(raw_text)
 
-        if not chunks:
-            st.error("Text splitting resulted in no chunks.")
-        else:
-            st.success(f"PDF processed successfully! Number of text chunks created: {len(chunks)}")
-
-            vectorstore = FAISS.from_texts(chunks, embedding=embeddings)
+    except ValueError as e:
+        st.error(str(e))
+    except Exception as e:
+        st.error(f"Error reading PDF file: {e}")
 
-            qa = RetrievalQA.from_chain_type(
-                llm=llm,
-                chain_type="stuff",
-                retriever=vectorstore.as_retriever(),
-            )
-    
     user_question = st.text_input("Ask a question about the PDF:")
 
-    if user_question:
+    if user_question and qa is not None:
                 with st.spinner("Generating answer..."):
                     response = qa.run(user_question)
                     st.write("Answer:")
-                    st.write(response)
\ No newline at end of file
+                    st.write(response)
@@ -0,0 +1,94 @@
+"""Speculative web search for AgenticRAG.
+
+When the relevance gate has to ask the LLM verifier, the answer may come from
+web search instead, so the search is started at the same time rather than
+after the verdict. ``SpeculativeSearch.start`` returns a handle. Callers that
+need the result call ``result()``. Callers that don't call ``release()``,
+which cancels the search once no one else is waiting for it.
+
+- identical queries already in flight share one search call
+- a call that has not started yet is cancelled outright; a running one gets
+  its ``cancelled`` event set so it can skip remaining work (e.g. the LLM
+  fallback after an empty search)
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict
+
+from resilient_search import normalize_search_query
+
+# (query, cancelled) -> search result text
+SearchFunction = Callable[[str, threading.Event], str]
+
+
+class _Call:
+    def __init__(self):
+        self.future: Future = None
+        self.cancelled = threading.Event()
+        self.refs = 0
+
+
+class SearchHandle:
+    """One caller's interest in a (possibly shared) search call"""
+
+    def __init__(self, owner: "SpeculativeSearch", key: str, call: _Call):
+        self._owner = owner
+        self._key = key
+        self._call = call
+        self._released = False
+
+    def result(self) -> str:
+        self._owner._count("used")
+        return self._call.future.result()
+
+    def release(self):
+        """Done with this search, whether or not its result was used; safe to call twice"""
+        if not self._released:
+            self._released = True
+            self._owner._release(self._key, self._call)
+
+
+class SpeculativeSearch:
+    def __init__(self, search: SearchFunction, max_workers: int = 4):
+        self.search = search
+        self.stats: Dict[str, int] = {"started": 0, "coalesced": 0, "used": 0, "cancelled": 0}
+        self._inflight: Dict[str, _Call] = {}
+        self._lock = threading.RLock()  # done callbacks can run inside start() and _release()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative-search")
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _finished(self, key: str, call: _Call):
+        with self._lock:
+            if self._inflight.get(key) is call:
+                del self._inflight[key]
+
+    def start(self, query: str) -> SearchHandle:
+        key = normalize_search_query(query)
+        with self._lock:
+            call = self._inflight.get(key)
+            if call is None:
+                self.stats["started"] += 1
+                call = _Call()
+                # Submitted under the lock so a coalescing caller never sees a call without a future
+                call.future = self._executor.submit(self.search, query, call.cancelled)
+                self._inflight[key] = call
+                call.future.add_done_callback(lambda _, key=key, call=call: self._finished(key, call))
+            else:
+                self.stats["coalesced"] += 1
+            call.refs += 1
+        return SearchHandle(self, key, call)
+
+    def _release(self, key: str, call: _Call):
+        with self._lock:
+            call.refs -= 1
+            if call.refs or call.future.done():
+                return
+            # Nobody is waiting any more: stop it and keep new callers from joining it
+            self.stats["cancelled"] += 1
+            call.cancelled.set()
+            call.future.cancel()
+            if self._inflight.get(key) is call:
+                del self._inflight[key]